@@ -0,0 +1,81 @@
+import argparse
+import json
+import sys
+
+
+def load_records(file_name):
+    """
+    Load benchmark records keyed by their case.
+
+    Args:
+        file_name (str): The JSON lines file written by the benchmark.
+
+    Returns:
+        dict: Records keyed by (family, size, mode, seed).
+    """
+    with open(file_name) as records:
+        return {(record['family'], record['size'],
+                 record['mode'], record['seed']): record
+                for record in map(json.loads, records)}
+
+
+def compare(baseline, candidate, time_tolerance=1.2,
+            ratio_tolerance=1e-6, min_time=0.01):
+    """
+    Find the cases where the candidate is slower or packs higher.
+
+    Args:
+        baseline (dict): Records of the baseline run.
+        candidate (dict): Records of the candidate run.
+        time_tolerance (float, optional):
+            The allowed ratio of the candidate time to the baseline
+            time. Defaults to 1.2.
+        ratio_tolerance (float, optional):
+            The allowed increase of the height to lower bound ratio.
+            Defaults to 1e-6.
+        min_time (float, optional):
+            Times below this many seconds are too noisy to compare.
+            Defaults to 0.01.
+
+    Returns:
+        list of str: Descriptions of the regressions.
+    """
+    regressions = []
+    for case in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[case], candidate[case]
+        if new['time'] > max(time_tolerance * old['time'], min_time):
+            regressions.append(
+                '{} time {:.3f}s -> {:.3f}s'.format(
+                    case, old['time'], new['time']))
+        if new['ratio'] > old['ratio'] + ratio_tolerance:
+            regressions.append(
+                '{} ratio {:.4f} -> {:.4f}'.format(
+                    case, old['ratio'], new['ratio']))
+    return regressions
+
+
+def main(argv=None):
+    """
+    Compare two benchmark files and exit with 1 on regressions.
+
+    Args:
+        argv (list of str, optional):
+            Command line arguments. Defaults to `sys.argv[1:]`.
+    """
+    parser = argparse.ArgumentParser(
+        description='Compare two benchmark runs.')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--time-tolerance', type=float, default=1.2)
+    args = parser.parse_args(argv)
+
+    regressions = compare(load_records(args.baseline),
+                          load_records(args.candidate),
+                          args.time_tolerance)
+    for regression in regressions:
+        print(regression)
+    sys.exit(1 if len(regressions) > 0 else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+from random import Random
+
+# Berkey and Wang classes I-VI: sides drawn from [1, max_side]
+# for a strip of the given width.
+BERKEY_WANG_CLASSES = {
+    'bw1': (10, 10),
+    'bw2': (10, 30),
+    'bw3': (35, 40),
+    'bw4': (35, 100),
+    'bw5': (100, 100),
+    'bw6': (100, 300),
+}
+
+# Martello and Vigo classes VII-X: the item type drawn with
+# probability 70%, the other three types sharing the rest.
+MARTELLO_VIGO_CLASSES = {
+    'mv7': 0,
+    'mv8': 1,
+    'mv9': 2,
+    'mv10': 3,
+}
+
+
+def uniform(count, seed=0, strip_width=1000):
+    """
+    Generate elements with sides uniform in [1, strip_width / 2].
+
+    Args:
+        count (int): The number of elements.
+        seed (int, optional): The random seed. Defaults to 0.
+        strip_width (int, optional):
+            The width of the strip. Defaults to 1000.
+
+    Returns:
+        tuple: The strip width and the list of elements.
+    """
+    rng = Random(seed)
+    return strip_width, [[rng.randint(1, strip_width // 2),
+                          rng.randint(1, strip_width // 2)]
+                         for _ in range(count)]
+
+
+def berkey_wang(count, seed=0, class_name='bw1'):
+    """
+    Generate an instance of the Berkey and Wang classes I-VI.
+
+    Reference:
+        J. O. Berkey, P. Y. Wang,
+        "Two-dimensional finite bin-packing algorithms",
+        J. Oper. Res. Soc. 38:5 (1987), 423–429.
+
+    Args:
+        count (int): The number of elements.
+        seed (int, optional): The random seed. Defaults to 0.
+        class_name (str, optional):
+            One of 'bw1', ..., 'bw6'. Defaults to 'bw1'.
+
+    Returns:
+        tuple: The strip width and the list of elements.
+    """
+    rng = Random(seed)
+    max_side, strip_width = BERKEY_WANG_CLASSES[class_name]
+    return strip_width, [[rng.randint(1, max_side),
+                          rng.randint(1, max_side)]
+                         for _ in range(count)]
+
+
+def martello_vigo(count, seed=0, class_name='mv7'):
+    """
+    Generate an instance of the Martello and Vigo classes VII-X.
+
+    The strip width is 100, and the items are of four types:
+    wide and low, narrow and high, large, and small.
+
+    Reference:
+        S. Martello, D. Vigo,
+        "Exact solution of the two-dimensional finite bin packing
+        problem", Management Science 44:3 (1998), 388–399.
+
+    Args:
+        count (int): The number of elements.
+        seed (int, optional): The random seed. Defaults to 0.
+        class_name (str, optional):
+            One of 'mv7', ..., 'mv10'. Defaults to 'mv7'.
+
+    Returns:
+        tuple: The strip width and the list of elements.
+    """
+    rng = Random(seed)
+    item_types = [((67, 100), (1, 50)),
+                  ((1, 50), (67, 100)),
+                  ((50, 100), (50, 100)),
+                  ((1, 50), (1, 50))]
+    main_type = MARTELLO_VIGO_CLASSES[class_name]
+    elements = []
+    for _ in range(count):
+        item_type = main_type if rng.random() < 0.7 \
+            else rng.choice([i for i in range(4) if i != main_type])
+        (min_width, max_width), (min_height, max_height) = \
+            item_types[item_type]
+        elements.append([rng.randint(min_width, max_width),
+                         rng.randint(min_height, max_height)])
+    return 100, elements
+
+
+def duplicates(count, seed=0, strip_width=1000, sku_count=50):
+    """
+    Generate elements repeating a few distinct sizes.
+
+    The frequencies of the sizes follow a Zipf-like law,
+    as for orders dominated by a few popular products.
+
+    Args:
+        count (int): The number of elements.
+        seed (int, optional): The random seed. Defaults to 0.
+        strip_width (int, optional):
+            The width of the strip. Defaults to 1000.
+        sku_count (int, optional):
+            The number of distinct sizes. Defaults to 50.
+
+    Returns:
+        tuple: The strip width and the list of elements.
+    """
+    rng = Random(seed)
+    sizes = [[rng.randint(1, strip_width // 3),
+              rng.randint(1, strip_width // 3)]
+             for _ in range(sku_count)]
+    weights = [1 / (rank + 1) for rank in range(sku_count)]
+    return strip_width, [list(size) for size in
+                         rng.choices(sizes, weights, k=count)]
+
+
+def wide_only(count, seed=0, strip_width=1000):
+    """
+    Generate elements wider than half of the strip.
+
+    Args:
+        count (int): The number of elements.
+        seed (int, optional): The random seed. Defaults to 0.
+        strip_width (int, optional):
+            The width of the strip. Defaults to 1000.
+
+    Returns:
+        tuple: The strip width and the list of elements.
+    """
+    rng = Random(seed)
+    return strip_width, [[rng.randint(strip_width // 2 + 1, strip_width),
+                          rng.randint(1, strip_width // 10)]
+                         for _ in range(count)]
+
+
+def tall_only(count, seed=0, strip_width=1000):
+    """
+    Generate narrow elements much higher than wide.
+
+    Args:
+        count (int): The number of elements.
+        seed (int, optional): The random seed. Defaults to 0.
+        strip_width (int, optional):
+            The width of the strip. Defaults to 1000.
+
+    Returns:
+        tuple: The strip width and the list of elements.
+    """
+    rng = Random(seed)
+    return strip_width, [[rng.randint(1, strip_width // 100),
+                          rng.randint(strip_width // 2, 2 * strip_width)]
+                         for _ in range(count)]
+
+
+FAMILIES = {
+    'uniform': uniform,
+    **{name: (lambda count, seed=0, class_name=name:
+              berkey_wang(count, seed, class_name))
+       for name in BERKEY_WANG_CLASSES},
+    **{name: (lambda count, seed=0, class_name=name:
+              martello_vigo(count, seed, class_name))
+       for name in MARTELLO_VIGO_CLASSES},
+    'duplicates': duplicates,
+    'wide': wide_only,
+    'tall': tall_only,
+}
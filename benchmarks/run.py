@@ -0,0 +1,129 @@
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from benchmarks.instances import FAMILIES
+from src.height_search import lower_bound
+from src.steinberg_packing import SteinbergPacking
+
+MODES = {
+    'original': (False, False),
+    'no-gaps': (True, False),
+    'dropped': (True, True),
+}
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000, 1000000]
+
+
+def run_case(family, count, mode, seed=0, measure_memory=True):
+    """
+    Pack one generated instance and measure the run.
+
+    The time is measured on a separate run from the peak memory,
+    because tracing allocations slows the packing down.
+
+    Args:
+        family (str): The name of the instance family.
+        count (int): The number of elements.
+        mode (str): One of 'original', 'no-gaps' and 'dropped'.
+        seed (int, optional): The random seed. Defaults to 0.
+        measure_memory (bool, optional):
+            Whether to measure the peak memory. Defaults to True.
+
+    Returns:
+        dict: The record of the run.
+    """
+    strip_width, elements = FAMILIES[family](count, seed)
+    without_gaps, drop_hanging_element = MODES[mode]
+
+    packing = SteinbergPacking(strip_width, without_gaps,
+                               drop_hanging_element)
+    start = time.perf_counter()
+    packing.get_packing(elements)
+    elapsed = time.perf_counter() - start
+
+    peak_memory = None
+    if measure_memory:
+        tracemalloc.start()
+        SteinbergPacking(strip_width, without_gaps,
+                         drop_hanging_element).get_packing(elements)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    height = packing.max_height()
+    bound = lower_bound(strip_width, elements)
+    return {
+        'family': family,
+        'size': count,
+        'mode': mode,
+        'seed': seed,
+        'time': elapsed,
+        'peak_memory': peak_memory,
+        'height': height,
+        'lower_bound': bound,
+        'ratio': height / bound,
+    }
+
+
+def current_commit():
+    """
+    Get the commit of the working tree, if it is a git repository.
+
+    Returns:
+        str or None: The abbreviated commit hash.
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    """
+    Run the benchmark and write one JSON record per line.
+
+    Args:
+        argv (list of str, optional):
+            Command line arguments. Defaults to `sys.argv[1:]`.
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmark the Steinberg strip packing.')
+    parser.add_argument('--families', nargs='+', default=list(FAMILIES),
+                        choices=list(FAMILIES))
+    parser.add_argument('--sizes', nargs='+', type=int,
+                        default=DEFAULT_SIZES)
+    parser.add_argument('--modes', nargs='+', default=list(MODES),
+                        choices=list(MODES))
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0])
+    parser.add_argument('--no-memory', action='store_true',
+                        help='skip the peak memory measurement')
+    parser.add_argument('--output', default='benchmark.jsonl',
+                        help='file to write the records to')
+    args = parser.parse_args(argv)
+
+    environment = {'commit': current_commit(),
+                   'python': platform.python_version()}
+    with open(args.output, 'w') as output:
+        for family in args.families:
+            for count in args.sizes:
+                for mode in args.modes:
+                    for seed in args.seeds:
+                        record = run_case(family, count, mode, seed,
+                                          not args.no_memory)
+                        record.update(environment)
+                        output.write(json.dumps(record) + '\n')
+                        output.flush()
+                        print('{family:>10} {size:>8} {mode:>9}: '
+                              'time={time:.3f}s '
+                              'ratio={ratio:.3f}'.format(**record),
+                              file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+from src.level_packing import BestFitPacking, FirstFitPacking, \
+    NextFitPacking
+from src.steinberg_packing import SteinbergPacking
+from src.strip_packing import StripPacking, element_sizes
+
+ENGINES = {
+    'steinberg': SteinbergPacking,
+    'nfdh': NextFitPacking,
+    'ffdh': FirstFitPacking,
+    'bfdh': BestFitPacking,
+}
+
+# Packing time per element in seconds, measured on the benchmark
+# families, which predicts whether an engine keeps within the budget.
+ENGINE_COSTS = {
+    'steinberg': 1e-5,
+    'nfdh': 1e-6,
+    'ffdh': 7e-6,
+    'bfdh': 4e-6,
+}
+
+
+def choose_engines(strip_width, elements, budget=None):
+    """
+    Choose the engines packing an instance within a time budget.
+
+    Best-Fit Decreasing Height gives the lowest packings of the level
+    algorithms at nearly the cost of Next-Fit, and it is lower than
+    the Steinberg algorithm on almost all benchmark instances. Only if
+    the highest element is as high as the area of the elements divided
+    by the strip width, the height of a level packing is dominated by
+    its first shelf, and the Steinberg algorithm is tried as well.
+    Next-Fit Decreasing Height is used if nothing else fits the budget.
+
+    Args:
+        strip_width (int): The width of the strip.
+        elements (list of lists or numpy.ndarray):
+            Elements, each given as [width, height],
+            or an (n, 2) array of them.
+        budget (float, optional):
+            Time in seconds for packing. Defaults to None,
+            allowing any time.
+
+    Returns:
+        list of str: Keys of `ENGINES` to pack the instance with.
+    """
+    widths, heights = element_sizes(elements)
+    if budget is not None and ENGINE_COSTS['bfdh'] * len(widths) > budget:
+        return ['nfdh']
+    cost = (ENGINE_COSTS['bfdh'] + ENGINE_COSTS['steinberg']) * len(widths)
+    if (len(widths) > 0 and (budget is None or cost <= budget)
+            and heights.max() * strip_width >= (widths * heights).sum()):
+        return ['bfdh', 'steinberg']
+    return ['bfdh']
+
+
+class AutoPacking(StripPacking):
+    """
+    A front end packing with the engine chosen for the instance.
+
+    Attributes:
+        engine (str):
+            The key of `ENGINES` to pack with, or 'auto' to choose
+            it by `choose_engines`.
+        budget (float or None):
+            Time in seconds for packing used to choose the engine.
+        options (dict):
+            Keyword arguments of SteinbergPacking.
+        chosen (str or None):
+            The engine which gave the last packing.
+    """
+
+    def __init__(self, strip_width: int, engine='auto', budget=None,
+                 **options):
+        """
+        Initialize AutoPacking class with a given strip width.
+
+        Args:
+            strip_width (int): The width of the strip for packing.
+            engine (str, optional):
+                'steinberg', 'nfdh', 'ffdh', 'bfdh' or 'auto'.
+                Defaults to 'auto'.
+            budget (float, optional):
+                Time in seconds for packing. Defaults to None,
+                allowing any time.
+            **options:
+                Keyword arguments of SteinbergPacking.
+        """
+        super().__init__(strip_width)
+        self.engine = engine
+        self.budget = budget
+        self.options = options
+        self.chosen = None
+
+    def get_packing(self, elements):
+        """
+        Pack the elements with the chosen engines and keep
+        the lowest packing.
+
+        Args:
+            elements (list of lists or numpy.ndarray):
+                Elements to be packed, each given as [width, height],
+                or an (n, 2) array of them.
+
+        Modifies:
+            self.height (float or None):
+                Sets this attribute to the height of the packing,
+                or to None if the packing is not feasible.
+            self.result (PackingResult or None):
+                Sets this attribute to the packing.
+            self.chosen (str or None):
+                Sets this attribute to the engine of the packing.
+
+        Returns:
+            PackingResult or None: The packing in the column form,
+                or None if the packing is not feasible.
+        """
+        engines = [self.engine] if self.engine != 'auto' \
+            else choose_engines(self.width, elements, self.budget)
+        self.result = None
+        self.height = None
+        self.chosen = None
+        best = None
+        for engine in engines:
+            if engine == 'steinberg':
+                packer = SteinbergPacking(self.width, **self.options)
+            else:
+                packer = ENGINES[engine](self.width)
+            result = packer.get_packing(elements)
+            if result is not None and (
+                    best is None
+                    or result.max_height() < best.max_height()):
+                best = result
+                self.height = packer.height
+                self.chosen = engine
+        self.result = best
+        return best
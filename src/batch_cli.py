@@ -0,0 +1,144 @@
+import argparse
+import sys
+import time
+
+from src.batch_packing import instance_options, pack_many
+from src.packing_io import open_placements, read_instances, \
+    write_placements
+from src.steinberg_packing import SteinbergPacking
+
+
+def pack_file(source, target, strip_width=None, workers=1, chunksize=64,
+              **options):
+    """
+    Pack the instances of a file and write their placements to another.
+
+    Args:
+        source (str):
+            The file of instances, read by `read_instances`.
+        target (str):
+            The `.npy` placement file, written by `open_placements`.
+        strip_width (int, optional):
+            The width of the strip of the instances which do not set
+            their own. Defaults to None.
+        workers (int, optional):
+            Number of worker processes. With 1 the instances are
+            packed in this process. Defaults to 1.
+        chunksize (int, optional):
+            Number of instances sent to a worker at once.
+            Defaults to 64.
+        **options:
+            Keyword arguments of SteinbergPacking for the instances
+            which do not set their own.
+
+    Returns:
+        dict: The numbers of instances, elements and failed instances,
+            and the time in seconds spent on reading and packing.
+    """
+    start = time.perf_counter()
+    instances, identifiers, offsets = read_instances(
+        source, strip_width, **options)
+    for instance in instances:
+        if instance['strip_width'] is None:
+            raise ValueError("The width of the strip is not given")
+    read_time = time.perf_counter() - start
+
+    placements = open_placements(target, identifiers, offsets)
+    if workers > 1:
+        results = pack_many(instances, workers, chunksize, ordered=False)
+    else:
+        results = enumerate(map(_pack_instance, instances))
+    failed = 0
+    for position, result in results:
+        failed += result is None
+        write_placements(placements, offsets[position], result)
+    placements.flush()
+    return {'instances': len(instances),
+            'elements': int(offsets[-1]),
+            'failed': failed,
+            'read_time': read_time,
+            'pack_time': time.perf_counter() - start - read_time}
+
+
+def _pack_instance(instance):
+    """
+    Pack an instance in this process.
+
+    Args:
+        instance (dict): The instance as accepted by `pack_many`.
+
+    Returns:
+        PackingResult or None: The packing of the instance.
+    """
+    return SteinbergPacking(
+        instance['strip_width'], **instance_options(instance)
+    ).get_packing(instance['elements'])
+
+
+def main(argv=None):
+    """
+    Pack the instances of a file from the command line.
+
+    Args:
+        argv (list of str, optional):
+            Command line arguments. Defaults to `sys.argv[1:]`.
+    """
+    parser = argparse.ArgumentParser(
+        description='Pack strips read from a CSV, JSON Lines or .npy '
+                    'file and write the placements to a .npy file.')
+    parser.add_argument('source', help='file of instances')
+    parser.add_argument('target', help='.npy file for the placements')
+    parser.add_argument('--strip-width', type=_number,
+                        help='width of the strip of every instance '
+                             'which does not set its own')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--chunksize', type=int, default=64)
+    parser.add_argument('--without-gaps', action='store_true')
+    parser.add_argument('--drop-hanging-element', action='store_true')
+    parser.add_argument('--round-value', type=int, default=6)
+    parser.add_argument('--fixed-point', action='store_true')
+    parser.add_argument('--tie-break', default='size',
+                        choices=['size', 'reverse', 'index'])
+    parser.add_argument('--aggregate', action='store_true',
+                        help='repeat the packings of equal containers, '
+                             'requires --fixed-point')
+    parser.add_argument('--aggregate-limit', type=int, default=256)
+    args = parser.parse_args(argv)
+
+    try:
+        report = pack_file(
+            args.source, args.target, args.strip_width, args.workers,
+            args.chunksize, without_gaps=args.without_gaps,
+            drop_hanging_element=args.drop_hanging_element,
+            round_value=args.round_value, fixed_point=args.fixed_point,
+            tie_break=args.tie_break, aggregate=args.aggregate,
+            aggregate_limit=args.aggregate_limit)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+    pack_time = max(report['pack_time'], 1e-9)
+    print('{instances} instances, {elements} elements, {failed} failed: '
+          'read {read_time:.3f}s, packed {pack_time:.3f}s'.format(**report),
+          file=sys.stderr)
+    print('{:.1f} instances/s, {:.1f} elements/s'.format(
+        report['instances'] / pack_time, report['elements'] / pack_time),
+        file=sys.stderr)
+
+
+def _number(text):
+    """
+    Parse a number, keeping whole numbers integer.
+
+    Args:
+        text (str): The number.
+
+    Returns:
+        int or float: The number.
+    """
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from src.steinberg_packing import SteinbergPacking
+
+# The keyword arguments of SteinbergPacking which an instance may set.
+PACKING_OPTIONS = ('without_gaps', 'drop_hanging_element', 'round_value',
+                   'fixed_point', 'cache', 'tie_break', 'debug',
+                   'incremental', 'aggregate', 'aggregate_limit')
+INSTANCE_KEYS = ('strip_width', 'elements') + PACKING_OPTIONS
+
+
+def pack_many(instances, workers=None, chunksize=1, ordered=True):
+    """
+    Pack many independent strips in a pool of processes.
+
+    Elements are sent to the workers as NumPy arrays, which pickle
+    as a single buffer instead of one object per element.
+
+    Args:
+        instances (iterable of dict):
+            Packing instances. Each one is a dict with the keys
+            `strip_width` and `elements`, and optionally the keyword
+            arguments of SteinbergPacking named in `PACKING_OPTIONS`.
+            A cache is shared between the workers only through
+            its on-disk store.
+
+            Example:
+                [{'strip_width': 10, 'elements': [[1, 1], [10, 8]]},
+                 {'strip_width': 5, 'elements': [[5, 2], [3, 3]],
+                  'without_gaps': True}]
+        workers (int, optional):
+            Number of worker processes.
+            Defaults to the number of processors.
+        chunksize (int, optional):
+            Number of instances sent to a worker at once.
+            Defaults to 1.
+        ordered (bool, optional):
+            Whether to yield results in the order of `instances`
+            instead of the order of completion.
+            Defaults to True.
+
+    Yields:
+        tuple: The position of the instance in `instances` and its
+            PackingResult, or None if the instance cannot be packed.
+
+    Raises:
+        ValueError: If an instance has a key not in `INSTANCE_KEYS`.
+    """
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        chunks = _compact_chunks(instances, chunksize)
+        if ordered:
+            for results in executor.map(_pack_chunk, chunks):
+                yield from results
+        else:
+            futures = [executor.submit(_pack_chunk, chunk)
+                       for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def instance_options(instance):
+    """
+    Get the keyword arguments of SteinbergPacking set by an instance.
+
+    Args:
+        instance (dict): The instance as accepted by `pack_many`.
+
+    Returns:
+        dict: The options of the instance.
+
+    Raises:
+        ValueError: If the instance has a key not in `INSTANCE_KEYS`.
+    """
+    unknown = instance.keys() - set(INSTANCE_KEYS)
+    if len(unknown) > 0:
+        raise ValueError("Unknown keys of the instance: "
+                         + ", ".join(sorted(unknown)))
+    return {key: instance[key] for key in PACKING_OPTIONS
+            if key in instance}
+
+
+def _compact_chunks(instances, chunksize):
+    """
+    Group instances into chunks with elements stored as arrays.
+
+    Args:
+        instances (iterable of dict):
+            Packing instances as accepted by `pack_many`.
+        chunksize (int):
+            Number of instances in a chunk.
+
+    Yields:
+        list: Chunks of instances, each given as
+            (position, strip_width, elements, options).
+    """
+    chunk = []
+    for position, instance in enumerate(instances):
+        chunk.append((position, instance['strip_width'],
+                      np.asarray(instance['elements']),
+                      instance_options(instance)))
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if len(chunk) > 0:
+        yield chunk
+
+
+def _pack_chunk(chunk):
+    """
+    Pack a chunk of instances in a worker process.
+
+    Args:
+        chunk (list):
+            Instances given as (position, strip_width, elements, options).
+
+    Returns:
+        list: Pairs of the position of the instance and its
+            PackingResult, or None if it cannot be packed.
+    """
+    results = []
+    for position, strip_width, elements, options in chunk:
+        packing = SteinbergPacking(strip_width, **options)
+        results.append((position, packing.get_packing(elements)))
+    return results
@@ -0,0 +1,128 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.steinberg_packing import SteinbergPacking
+from src.strip_packing import element_sizes
+
+# The packing of a worker process, prepared once for all its probes.
+_worker_packing = None
+
+
+def lower_bound(strip_width, elements):
+    """
+    Calculate a lower bound of the optimal packing height.
+
+    It is the largest of the area bound, the highest element, and
+    the total height of the elements wider than half of the strip,
+    which cannot be placed side by side.
+
+    Args:
+        strip_width (int): The width of the strip.
+        elements (list of lists or numpy.ndarray):
+            Elements, each given as [width, height],
+            or an (n, 2) array of them.
+
+    Returns:
+        float: The lower bound.
+    """
+    widths, heights = element_sizes(elements)
+    return max((widths * heights).sum().item() / strip_width,
+               heights.max().item(),
+               heights[2 * widths > strip_width].sum().item())
+
+
+def minimize_height(strip_width, elements, tolerance=1, workers=1,
+                    probes=None, **options):
+    """
+    Search the least strip height into which the Steinberg algorithm
+    packs the elements.
+
+    The height estimated by `get_packing` always suffices, but the
+    algorithm often succeeds in lower strips. The heights between the
+    lower bound and the lowest successful height are probed, several
+    at once spread evenly across the interval, until it is narrower
+    than the tolerance. Success is not monotone in the height, so
+    the result is the best packing found rather than the optimum.
+
+    Args:
+        strip_width (int): The width of the strip for packing.
+        elements (list of lists):
+            Elements to be packed, each given as [width, height].
+        tolerance (float, optional):
+            The width of the height interval where the search stops.
+            Defaults to 1.
+        workers (int, optional):
+            Number of worker processes probing heights.
+            With 1 the heights are probed in this process.
+            Defaults to 1.
+        probes (int, optional):
+            Number of heights probed at once.
+            Defaults to the number of workers.
+        **options:
+            Keyword arguments of SteinbergPacking.
+
+    Returns:
+        PackingResult or None: The lowest packing found,
+            or None if the elements cannot be packed.
+    """
+    packing = SteinbergPacking(strip_width, **options)
+    best = packing.get_packing(elements)
+    if best is None:
+        return None
+    probes = workers if probes is None else probes
+
+    executor = None
+    probe = packing.repack
+    if workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(strip_width, np.asarray(elements), options))
+        probe = _repack
+    try:
+        low = lower_bound(strip_width, elements)
+        high = best.max_height()
+        while high - low > tolerance:
+            heights = [low + (high - low) * (k + 1) / (probes + 1)
+                       for k in range(probes)]
+            results = executor.map(probe, heights) \
+                if executor is not None else map(probe, heights)
+            for height, result in zip(heights, results):
+                if result is None:
+                    low = height
+                    continue
+                if result.max_height() < best.max_height():
+                    best = result
+                high = min(height, best.max_height())
+                break
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return best
+
+
+def _init_worker(strip_width, elements, options):
+    """
+    Prepare the packing of a worker process.
+
+    Args:
+        strip_width (int): The width of the strip for packing.
+        elements (numpy.ndarray): Elements to be packed.
+        options (dict): Keyword arguments of SteinbergPacking.
+    """
+    global _worker_packing
+    _worker_packing = SteinbergPacking(strip_width, **options)
+    _worker_packing.get_packing(elements)
+
+
+def _repack(height):
+    """
+    Probe a height in a worker process.
+
+    Args:
+        height (float): The height of the strip.
+
+    Returns:
+        PackingResult or None: The packing, or None if it failed.
+    """
+    return _worker_packing.repack(height)
@@ -0,0 +1,168 @@
+from abc import abstractmethod
+from bisect import bisect_left, insort
+
+import numpy as np
+
+from src.packing_result import PackingResult
+from src.strip_packing import StripPacking, element_sizes
+
+
+class LevelPacking(StripPacking):
+    """
+    Base class for the level algorithms of strip packing.
+
+    The elements are sorted by height in non-increasing order and
+    placed left to right on shelves, whose height is the height
+    of the first element placed on them. The shelves are stacked
+    from the bottom of the strip. Subclasses choose the shelf of
+    every element.
+
+    Reference:
+        E. G. Coffman, M. R. Garey, D. S. Johnson, R. E. Tarjan,
+        "Performance bounds for level-oriented two-dimensional
+        packing algorithms", SIAM J. Comput. 9:4 (1980), 808–826.
+    """
+
+    def get_packing(self, elements):
+        """
+        Pack the elements on shelves.
+
+        Args:
+            elements (list of lists or numpy.ndarray):
+                Elements to be packed, each given as [width, height],
+                or an (n, 2) array of them.
+
+        Modifies:
+            self.height (float or None):
+                Sets this attribute to the height of the packing,
+                or to None if the packing is not feasible.
+            self.result (PackingResult or None):
+                Sets this attribute to the packing.
+
+        Returns:
+            PackingResult or None: The packing in the column form,
+                or None if the packing is not feasible.
+        """
+        self.result = None
+        self.height = None
+        widths, heights = element_sizes(elements)
+        if len(widths) == 0 or widths.max() > self.width:
+            print("Packing probem cannot be solved")
+            return None
+
+        order = np.lexsort((-widths, -heights))
+        widths = widths[order]
+        heights = heights[order]
+        shelves, x = self._assign_shelves(widths)
+        # Shelves are opened in the order of the elements, so the first
+        # element of a shelf is its highest one.
+        openers = np.unique(shelves, return_index=True)[1]
+        tops = np.cumsum(heights[openers])
+        bottoms = np.concatenate(([0], tops[:-1]))
+
+        self.result = PackingResult(self.width, tops[-1].item(), x,
+                                    bottoms[shelves], widths, heights,
+                                    order)
+        self.height = self.result.height
+        return self.result
+
+    @abstractmethod
+    def _assign_shelves(self, widths):
+        """
+        Choose the shelves of the elements.
+
+        This method should be implemented by subclasses. Shelves are
+        numbered from 0 in the order in which they are opened.
+
+        Args:
+            widths (numpy.ndarray):
+                Widths of the elements in the order of placement.
+
+        Returns:
+            tuple: The shelf of every element and its x coordinate
+                (numpy.ndarray).
+        """
+        pass
+
+
+class NextFitPacking(LevelPacking):
+    """
+    Next-Fit Decreasing Height: an element is placed on the last
+    shelf, or on a new one if it does not fit there.
+
+    The height is at most twice the optimal one plus the highest
+    element, and the elements are placed in a single linear pass.
+    """
+
+    def _assign_shelves(self, widths):
+        shelves = []
+        x = []
+        shelf = -1
+        used = self.width
+        for width in widths.tolist():
+            if used + width > self.width:
+                shelf += 1
+                used = 0
+            shelves.append(shelf)
+            x.append(used)
+            used += width
+        return np.array(shelves, dtype=np.intp), np.array(x)
+
+
+class FirstFitPacking(LevelPacking):
+    """
+    First-Fit Decreasing Height: an element is placed on the lowest
+    shelf where it fits, or on a new one.
+
+    The height is at most 1.7 times the optimal one plus the highest
+    element. The lowest fitting shelf is found in O(log n) time by
+    a tree keeping the largest free width of the shelves below every
+    node, in which the shelves not opened yet are entirely free.
+    """
+
+    def _assign_shelves(self, widths):
+        size = 1
+        while size < len(widths):
+            size *= 2
+        free = [self.width] * (2 * size)
+        shelves = []
+        x = []
+        for width in widths.tolist():
+            node = 1
+            while node < size:
+                node = 2 * node if free[2 * node] >= width else 2 * node + 1
+            shelves.append(node - size)
+            x.append(self.width - free[node])
+            free[node] -= width
+            node //= 2
+            while node > 0:
+                free[node] = max(free[2 * node], free[2 * node + 1])
+                node //= 2
+        return np.array(shelves, dtype=np.intp), np.array(x)
+
+
+class BestFitPacking(LevelPacking):
+    """
+    Best-Fit Decreasing Height: an element is placed on the shelf
+    where it leaves the least free width, or on a new one.
+
+    The shelves are kept sorted by their free width, so the best one
+    is found by a binary search.
+    """
+
+    def _assign_shelves(self, widths):
+        free = []
+        shelves = []
+        x = []
+        shelf_count = 0
+        for width in widths.tolist():
+            position = bisect_left(free, (width, -1))
+            if position < len(free):
+                shelf_free, shelf = free.pop(position)
+            else:
+                shelf_free, shelf = self.width, shelf_count
+                shelf_count += 1
+            shelves.append(shelf)
+            x.append(self.width - shelf_free)
+            insort(free, (shelf_free - width, shelf))
+        return np.array(shelves, dtype=np.intp), np.array(x)
@@ -0,0 +1,204 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from src.packing_result import PackingResult
+from src.strip_packing import element_sizes
+
+
+class PackingCache:
+    """
+    A content-addressed cache of packings.
+
+    A packing is keyed by a hash of the strip width, the options of
+    the algorithm and the sizes of the elements sorted by width and
+    height, so the same multiset of elements hits the cache whatever
+    its order. The cached rows refer to the elements by their rank in
+    the sorted order and are mapped back onto the order of the caller.
+
+    The most recently used packings are kept in memory. If a directory
+    is given, packings are also stored there as `.npz` files, which
+    lets several processes share them. A pickled cache keeps only its
+    settings, so it can be sent to worker processes cheaply. The packings
+    in memory are guarded by a lock, so threads can share a cache.
+
+    Attributes:
+        max_size (int):
+            The number of packings kept in memory.
+        directory (str or None):
+            The directory of the on-disk store.
+    """
+
+    def __init__(self, max_size=1024, directory=None):
+        """
+        Initialize PackingCache class.
+
+        Args:
+            max_size (int, optional):
+                The number of packings kept in memory.
+                Defaults to 1024.
+            directory (str, optional):
+                The directory of the on-disk store, created if needed.
+                Defaults to None, keeping packings in memory only.
+        """
+        self.max_size = max_size
+        self.directory = directory
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __getstate__(self):
+        return {'max_size': self.max_size, 'directory': self.directory}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get(self, strip_width, elements, options):
+        """
+        Find the packing of the elements.
+
+        Args:
+            strip_width (int): The width of the strip.
+            elements (list of lists):
+                Elements, each given as [width, height].
+            options (tuple): The options of the algorithm.
+
+        Returns:
+            PackingResult or None: The cached packing with the `index`
+                column referring to `elements`, or None on a miss.
+        """
+        key, order = self.__canonical(strip_width, elements, options)
+        with self.__lock:
+            result = self.__entries.get(key)
+            if result is not None:
+                self.__entries.move_to_end(key)
+        if result is None and self.directory is not None:
+            result = self.__load(key)
+            if result is not None:
+                self.__remember(key, result)
+        if result is None:
+            return None
+        return PackingResult(result.width, result.height,
+                             result.x.copy(), result.y.copy(),
+                             result.w.copy(), result.h.copy(),
+                             order[result.index])
+
+    def put(self, strip_width, elements, options, result):
+        """
+        Store the packing of the elements.
+
+        Args:
+            strip_width (int): The width of the strip.
+            elements (list of lists):
+                Elements, each given as [width, height].
+            options (tuple): The options of the algorithm.
+            result (PackingResult): The packing of `elements`.
+        """
+        key, order = self.__canonical(strip_width, elements, options)
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        result = PackingResult(result.width, result.height,
+                               result.x.copy(), result.y.copy(),
+                               result.w.copy(), result.h.copy(),
+                               rank[result.index])
+        self.__remember(key, result)
+        if self.directory is not None:
+            self.__store(key, result)
+
+    def clear(self):
+        """
+        Remove the packings kept in memory.
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def __canonical(self, strip_width, elements, options):
+        """
+        Calculate the key of the elements and their sorted order.
+
+        Args:
+            strip_width (int): The width of the strip.
+            elements (list of lists):
+                Elements, each given as [width, height].
+            options (tuple): The options of the algorithm.
+
+        Returns:
+            tuple: The hexadecimal key and the positions of
+                the elements sorted by width and height.
+        """
+        widths, heights = element_sizes(elements)
+        order = np.lexsort((heights, widths))
+        digest = hashlib.sha256(
+            repr((strip_width, options, widths.dtype.str,
+                  heights.dtype.str, len(order))).encode())
+        digest.update(widths[order].tobytes())
+        digest.update(heights[order].tobytes())
+        return digest.hexdigest(), order
+
+    def __remember(self, key, result):
+        """
+        Keep the packing in memory, evicting the least recently used.
+
+        Args:
+            key (str): The key of the packing.
+            result (PackingResult): The packing in the sorted order.
+        """
+        with self.__lock:
+            self.__entries[key] = result
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_size:
+                self.__entries.popitem(last=False)
+
+    def __load(self, key):
+        """
+        Read the packing from the on-disk store.
+
+        Args:
+            key (str): The key of the packing.
+
+        Returns:
+            PackingResult or None: The packing in the sorted order,
+                or None if it is not stored.
+        """
+        try:
+            with np.load(os.path.join(self.directory, key + '.npz')) \
+                    as stored:
+                return PackingResult(stored['width'].item(),
+                                     stored['height'].item(),
+                                     stored['x'], stored['y'],
+                                     stored['w'], stored['h'],
+                                     stored['index'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def __store(self, key, result):
+        """
+        Write the packing to the on-disk store.
+
+        The file is written under a temporary name and then renamed,
+        so other processes never read a partial file.
+
+        Args:
+            key (str): The key of the packing.
+            result (PackingResult): The packing in the sorted order.
+        """
+        descriptor, temporary = tempfile.mkstemp(
+            dir=self.directory, suffix='.npz')
+        try:
+            with os.fdopen(descriptor, 'wb') as stored:
+                np.savez(stored, width=result.width, height=result.height,
+                         x=result.x, y=result.y, w=result.w, h=result.h,
+                         index=result.index)
+            os.replace(temporary, os.path.join(self.directory,
+                                               key + '.npz'))
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
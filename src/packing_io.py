@@ -0,0 +1,201 @@
+import json
+import os
+
+import numpy as np
+
+from src.batch_packing import INSTANCE_KEYS
+
+# A placement row of the output file. The rows follow the rows of the
+# input, so the row `i` describes the element read `i`-th.
+PLACEMENT_DTYPE = np.dtype([('instance', np.int64), ('x', np.float64),
+                            ('y', np.float64), ('w', np.float64),
+                            ('h', np.float64)])
+
+
+def read_instances(path, strip_width=None, **options):
+    """
+    Read packing instances from a file.
+
+    The format follows the extension of the file:
+
+    - `.csv`: rows `instance,width,height`, or `width,height` for a
+      single instance, optionally below a header line.
+    - `.npy`: an array of shape (n, 3) or (n, 2) with the same columns,
+      memory-mapped instead of read into memory.
+    - `.jsonl`: one instance per line, given as a dict with the keys
+      `elements` and optionally an integer `id`, `strip_width` and the
+      options accepted by `pack_many`.
+
+    The rows of an instance in a CSV or `.npy` file are consecutive.
+
+    Args:
+        path (str): The path of the file.
+        strip_width (int, optional):
+            The width of the strip of the instances which do not set
+            their own. Defaults to None.
+        **options:
+            Keyword arguments of SteinbergPacking for the instances
+            which do not set their own.
+
+    Returns:
+        tuple: The list of instances as accepted by `pack_many`, the
+            identifier of every instance, and the offset of the first
+            row of every instance followed by the number of rows.
+
+    Raises:
+        ValueError: If the format is unknown, or if a JSON Lines record
+            has an identifier which is not an integer or a key not
+            accepted by `pack_many`.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.jsonl':
+        return _read_jsonl(path, strip_width, options)
+    if extension == '.npy':
+        table = np.load(path, mmap_mode='r')
+    elif extension == '.csv':
+        table = _read_csv(path)
+    else:
+        raise ValueError("Unknown instance format: " + extension)
+
+    if table.ndim != 2 or table.shape[1] not in (2, 3):
+        raise ValueError("Instance table must have 2 or 3 columns")
+    if table.shape[1] == 2:
+        identifiers = np.zeros(1, dtype=np.int64)
+        offsets = np.array([0, len(table)])
+    else:
+        ids = table[:, 0]
+        offsets = np.concatenate(([0], np.flatnonzero(ids[1:] != ids[:-1])
+                                  + 1, [len(table)]))
+        identifiers = np.asarray(ids[offsets[:-1]]).astype(np.int64)
+        table = table[:, 1:]
+    instances = [dict(options, strip_width=strip_width,
+                      elements=table[start:stop])
+                 for start, stop in zip(offsets[:-1], offsets[1:])]
+    return instances, identifiers, offsets
+
+
+def _read_csv(path):
+    """
+    Read a numeric CSV table, skipping a header line if present.
+
+    Sizes are read as integers if all of them are whole numbers,
+    as the fixed-point arithmetic requires.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        numpy.ndarray: The table.
+    """
+    with open(path) as source:
+        first = source.readline()
+    header = any(character.isalpha() for character in first)
+    table = np.loadtxt(path, delimiter=',', skiprows=int(header),
+                       ndmin=2)
+    if np.array_equal(table, np.floor(table)):
+        table = table.astype(np.int64)
+    return table
+
+
+def _read_jsonl(path, strip_width, options):
+    """
+    Read instances given one per line as JSON objects.
+
+    Args:
+        path (str): The path of the file.
+        strip_width (int or None): The default width of the strip.
+        options (dict): Default keyword arguments of SteinbergPacking.
+
+    Returns:
+        tuple: The instances, their identifiers and offsets
+            as returned by `read_instances`.
+    """
+    instances = []
+    identifiers = []
+    counts = [0]
+    with open(path) as source:
+        for number, line in enumerate(source, 1):
+            if line.strip() == '':
+                continue
+            record = json.loads(line)
+            unknown = record.keys() - {'id'} - set(INSTANCE_KEYS)
+            if len(unknown) > 0:
+                raise ValueError("Unknown keys {} in line {} of {}".format(
+                    ", ".join(sorted(unknown)), number, path))
+            identifier = record.pop('id', len(identifiers))
+            # The identifiers are stored in an int64 column.
+            if not isinstance(identifier, int) \
+                    or isinstance(identifier, bool):
+                raise ValueError("The id {!r} in line {} of {} is not an "
+                                 "integer".format(identifier, number, path))
+            identifiers.append(identifier)
+            record['elements'] = np.asarray(
+                record['elements']).reshape(-1, 2)
+            instance = dict(options, strip_width=strip_width)
+            instance.update(record)
+            instances.append(instance)
+            counts.append(len(record['elements']))
+    return (instances, np.array(identifiers, dtype=np.int64),
+            np.cumsum(counts))
+
+
+def open_placements(path, identifiers, offsets):
+    """
+    Create a placement file which can be filled in place.
+
+    The file is a `.npy` array of `PLACEMENT_DTYPE` rows with
+    the coordinates set to NaN until they are written.
+
+    Args:
+        path (str): The path of the file.
+        identifiers (numpy.ndarray): The identifiers of the instances.
+        offsets (numpy.ndarray):
+            The first row of every instance followed by the number
+            of rows, as returned by `read_instances`.
+
+    Returns:
+        numpy.memmap: The rows of the file.
+    """
+    placements = np.lib.format.open_memmap(
+        path, mode='w+', dtype=PLACEMENT_DTYPE, shape=(int(offsets[-1]),))
+    placements['instance'] = np.repeat(identifiers, np.diff(offsets))
+    for field in ('x', 'y', 'w', 'h'):
+        placements[field] = np.nan
+    return placements
+
+
+def write_placements(placements, start, result):
+    """
+    Write the packing of an instance to its rows of a placement file.
+
+    Args:
+        placements (numpy.ndarray): The rows of the placement file.
+        start (int): The first row of the instance.
+        result (PackingResult or None):
+            The packing of the instance, or None if it failed,
+            which leaves the coordinates NaN.
+
+    Modifies:
+        placements: The rows of the instance.
+    """
+    if result is None:
+        return
+    rows = start + result.index
+    placements['x'][rows] = result.x
+    placements['y'][rows] = result.y
+    placements['w'][rows] = result.w
+    placements['h'][rows] = result.h
+
+
+def load_placements(path):
+    """
+    Map a placement file into memory.
+
+    Args:
+        path (str): The path of the file.
+
+    Returns:
+        numpy.memmap: The rows of the file with the fields
+            `instance`, `x`, `y`, `w` and `h`.
+    """
+    return np.load(path, mmap_mode='r')
@@ -0,0 +1,188 @@
+import gc
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+# Conversions pausing the garbage collector, counted under the lock, so
+# that concurrent ones do not enable it while another one is running.
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_was_enabled = False
+
+
+@contextmanager
+def _paused_gc():
+    """
+    Pause the garbage collector while the context runs, restoring it
+    when the last of the concurrent contexts ends.
+    """
+    global _gc_pauses, _gc_was_enabled
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+class PackingResult:
+    """
+    Array-backed result of a strip packing.
+
+    Every packed element is a row in a few contiguous columns instead
+    of a nested list, and the `index` column maps the row back to the
+    position of the element in the input list.
+
+    Attributes:
+        width (float):
+            The width of the strip.
+        height (float):
+            The estimated height of the packing.
+        x (numpy.ndarray):
+            X coordinates of the bottom-left corners of the elements.
+        y (numpy.ndarray):
+            Y coordinates of the bottom-left corners of the elements.
+        w (numpy.ndarray):
+            Widths of the elements.
+        h (numpy.ndarray):
+            Heights of the elements.
+        index (numpy.ndarray):
+            Positions of the elements in the input list.
+        cut_short (bool):
+            Whether the packing was stopped before its end
+            by a deadline or a cancellation.
+    """
+
+    __slots__ = ('width', 'height', 'x', 'y', 'w', 'h', 'index',
+                 'cut_short', '__frozen')
+
+    def __init__(self, width, height, x, y, w, h, index, cut_short=False):
+        """
+        Initialize the PackingResult class with the packing columns.
+
+        Args:
+            width (float):
+                The width of the strip.
+            height (float):
+                The estimated height of the packing.
+            x (numpy.ndarray), y (numpy.ndarray):
+                Coordinates of the bottom-left corners of the elements.
+            w (numpy.ndarray), h (numpy.ndarray):
+                Sizes of the elements.
+            index (numpy.ndarray):
+                Positions of the elements in the input list.
+            cut_short (bool, optional):
+                Whether the packing was stopped before its end.
+                Defaults to False.
+        """
+        self.width = width
+        self.height = height
+        self.x = x
+        self.y = y
+        self.w = w
+        self.h = h
+        self.index = index
+        self.cut_short = cut_short
+
+    @classmethod
+    def from_packing(cls, width, height, packing, index):
+        """
+        Build the result from the list form of a packing.
+
+        Args:
+            width (float):
+                The width of the strip.
+            height (float):
+                The estimated height of the packing.
+            packing (list):
+                Packed elements, each given as [[x, y], [width, height]].
+            index (list of int):
+                Positions of the packed elements in the input list.
+
+        Returns:
+            PackingResult: The packing in the column form.
+        """
+        return cls(width, height,
+                   np.array([el[0][0] for el in packing]),
+                   np.array([el[0][1] for el in packing]),
+                   np.array([el[1][0] for el in packing]),
+                   np.array([el[1][1] for el in packing]),
+                   np.array(index, dtype=np.intp))
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_PackingResult__frozen', False):
+            raise AttributeError("PackingResult is frozen")
+        object.__setattr__(self, name, value)
+
+    def freeze(self):
+        """
+        Make the result immutable: its columns become read-only and
+        its attributes cannot be set any more, so it can be shared
+        between threads.
+
+        Returns:
+            PackingResult: The result itself.
+        """
+        for column in (self.x, self.y, self.w, self.h, self.index):
+            column.flags.writeable = False
+        self.__frozen = True
+        return self
+
+    def __len__(self):
+        return len(self.index)
+
+    def max_height(self):
+        """
+        Calculate the maximum height of the packing.
+
+        Returns:
+            float: The maximum height of the packing.
+        """
+        if len(self) == 0:
+            return 0
+        return (self.y + self.h).max().item()
+
+    def in_input_order(self):
+        """
+        Reorder the rows to follow the input list of elements.
+
+        The rows are sorted by `index`. The indices need not be
+        a permutation of the rows: after `remove_elements` of the
+        incremental mode they keep their values, so the indices of
+        the removed elements are missing, and the elements added by
+        `add_elements` follow the earlier ones.
+
+        Returns:
+            PackingResult: The same packing with the rows in the order
+                of the elements in the input list, which is the row `i`
+                describing the element `i` if no element was removed.
+        """
+        order = np.argsort(self.index, kind='stable')
+        return PackingResult(self.width, self.height,
+                             self.x[order], self.y[order],
+                             self.w[order], self.h[order],
+                             self.index[order], self.cut_short)
+
+    def to_packing(self):
+        """
+        Convert the result to the list form used by StripPacking.
+
+        The new lists cannot form reference cycles, so the garbage
+        collector, which would otherwise be triggered again and again
+        by the millions of them, is paused meanwhile.
+
+        Returns:
+            list: Packed elements, each given as
+                [[x, y], [width, height]].
+        """
+        with _paused_gc():
+            return [[[x, y], [w, h]]
+                    for x, y, w, h in zip(self.x.tolist(), self.y.tolist(),
+                                          self.w.tolist(), self.h.tolist())]
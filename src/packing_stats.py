@@ -0,0 +1,77 @@
+class PackingStats:
+    """
+    Counters and timings of a run of the Steinberg algorithm.
+
+    The time spent on a container, including the search for its phase,
+    is attributed to the phase performed on it.
+
+    Attributes:
+        phase_counts (dict):
+            How many times each phase was performed,
+            keyed by 'p0', 'p1', 'pm1', 'p2', 'pm2', 'p3' and 'pm3'.
+        phase_times (dict):
+            Cumulative time in seconds spent on each phase.
+        step_times (dict):
+            Time in seconds of the packing steps:
+            'steinberg', 'remove_gaps' and 'drop_hanging_elements'.
+        containers (int):
+            The number of containers processed.
+        max_depth (int):
+            The maximal nesting depth of containers.
+    """
+
+    PHASES = ('p0', 'p1', 'pm1', 'p2', 'pm2', 'p3', 'pm3')
+
+    def __init__(self):
+        """
+        Initialize PackingStats class with zero counters.
+        """
+        self.phase_counts = dict.fromkeys(self.PHASES, 0)
+        self.phase_times = dict.fromkeys(self.PHASES, 0.0)
+        self.step_times = {}
+        self.containers = 0
+        self.max_depth = 0
+
+    def add_container(self, phase, depth, elapsed):
+        """
+        Record a processed container.
+
+        Args:
+            phase (str or None):
+                The phase performed on the container,
+                or None if no phase was applied.
+            depth (int):
+                The nesting depth of the container.
+            elapsed (float):
+                Time in seconds spent on the container.
+        """
+        self.containers += 1
+        self.max_depth = max(self.max_depth, depth)
+        if phase is not None:
+            self.phase_counts[phase] += 1
+            self.phase_times[phase] += elapsed
+
+    def add_step(self, step, elapsed):
+        """
+        Record the time of a packing step.
+
+        Args:
+            step (str): The name of the step.
+            elapsed (float): Time in seconds spent on the step.
+        """
+        self.step_times[step] = self.step_times.get(step, 0.0) + elapsed
+
+    def as_dict(self):
+        """
+        Collect the statistics into a plain dictionary.
+
+        Returns:
+            dict: The statistics, suitable for logging or JSON.
+        """
+        return {
+            'phase_counts': dict(self.phase_counts),
+            'phase_times': dict(self.phase_times),
+            'step_times': dict(self.step_times),
+            'containers': self.containers,
+            'max_depth': self.max_depth,
+        }
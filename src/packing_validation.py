@@ -0,0 +1,206 @@
+from bisect import bisect_left
+from collections import Counter
+
+import numpy as np
+
+
+def find_problems(packing, width, height=None, elements=None,
+                  tolerance=0, first_only=False):
+    """
+    Find the problems of a packing.
+
+    Args:
+        packing (list):
+            Packed elements, each given as [[x, y], [width, height]].
+        width (float):
+            The width of the strip.
+        height (float, optional):
+            The height of the strip. Defaults to None, leaving
+            the height unbounded.
+        elements (list of lists or numpy.ndarray, optional):
+            Elements which must be packed, each given as
+            [width, height], or an (n, 2) array of them.
+            Defaults to None, skipping the check.
+        tolerance (float, optional):
+            Overlaps and protrusions not longer than the tolerance
+            are ignored. Defaults to 0.
+        first_only (bool, optional):
+            Whether to stop at the first problem. Defaults to False.
+
+    Returns:
+        list of tuple: The problems, empty for a valid packing:
+            ('count', size, expected, packed) for a size of elements
+            packed a wrong number of times, ('outside', i) for the row
+            `i` of the packing crossing the border of the strip, and
+            ('overlap', i, k) for overlapping rows `i` and `k`.
+    """
+    return find_column_problems(
+        np.array([el[0][0] for el in packing]),
+        np.array([el[0][1] for el in packing]),
+        np.array([el[1][0] for el in packing]),
+        np.array([el[1][1] for el in packing]),
+        width, height, elements, tolerance, first_only)
+
+
+def find_column_problems(x, y, w, h, width, height=None, elements=None,
+                         tolerance=0, first_only=False):
+    """
+    Find the problems of a packing given in the column form.
+
+    Args:
+        x (numpy.ndarray), y (numpy.ndarray):
+            Coordinates of the bottom-left corners of the elements.
+        w (numpy.ndarray), h (numpy.ndarray):
+            Sizes of the elements.
+        width (float), height (float, optional), elements (optional),
+        tolerance (float, optional), first_only (bool, optional):
+            As for `find_problems`.
+
+    Returns:
+        list of tuple: The problems as described in `find_problems`,
+            with the rows of the columns in place of the rows of
+            the packing.
+    """
+    problems = []
+    if elements is not None:
+        expected = Counter(map(tuple, np.asarray(elements)
+                               .reshape(-1, 2).tolist()))
+        packed = Counter(zip(np.asarray(w).tolist(),
+                             np.asarray(h).tolist()))
+        for size in expected.keys() | packed.keys():
+            if expected[size] != packed[size]:
+                problems.append(('count', size,
+                                 expected[size], packed[size]))
+                if first_only:
+                    return problems
+
+    if len(x) == 0:
+        return problems
+    x = np.asarray(x)
+    y = np.asarray(y)
+    w = np.asarray(w)
+    h = np.asarray(h)
+    outside = (x < -tolerance) | (y < -tolerance) \
+        | (x + w > width + tolerance)
+    if height is not None:
+        outside |= y + h > height + tolerance
+    for i in outside.nonzero()[0].tolist():
+        problems.append(('outside', i))
+        if first_only:
+            return problems
+
+    problems.extend(('overlap', i, k) for i, k in find_overlaps(
+        x.tolist(), y.tolist(), w.tolist(), h.tolist(),
+        tolerance, first_only))
+    return problems
+
+
+def find_overlaps(x, y, w, h, tolerance=0, first_only=False):
+    """
+    Find the pairs of overlapping rectangles.
+
+    The rectangles are swept from left to right keeping the vertical
+    intervals of those crossing the sweep line sorted. These intervals
+    are disjoint until the first overlap, which is then found between
+    a new interval and its neighbours, so a valid packing is confirmed
+    in O(n log n) time. If there is an overlap and all of them are
+    required, the sweep is repeated with an interval tree reporting
+    every interval which a new one meets, in O((n + k) log n) time
+    for `k` overlapping pairs.
+
+    Args:
+        x (list), y (list):
+            Coordinates of the bottom-left corners of the rectangles.
+        w (list), h (list):
+            Sizes of the rectangles.
+        tolerance (float, optional):
+            Overlaps not longer than the tolerance are ignored.
+            Defaults to 0.
+        first_only (bool, optional):
+            Whether to stop at the first overlap. Defaults to False.
+
+    Returns:
+        list of tuple: Pairs (i, k) of the positions of overlapping
+            rectangles with i < k.
+    """
+    events = []
+    intervals = []
+    for k in range(len(x)):
+        if w[k] > tolerance and h[k] > tolerance:
+            interval = (y[k], y[k] + h[k] - tolerance, k)
+            intervals.append(interval)
+            events.append((x[k] + w[k] - tolerance, 0, interval))
+            events.append((x[k], 1, interval))
+    events.sort()
+
+    active = []
+    for _, is_start, interval in events:
+        position = bisect_left(active, interval)
+        if not is_start:
+            del active[position]
+            continue
+        overlap = None
+        if position > 0 and active[position - 1][1] > interval[0]:
+            overlap = active[position - 1][2]
+        elif (position < len(active)
+                and active[position][0] < interval[1]):
+            overlap = active[position][2]
+        if overlap is not None:
+            if first_only:
+                return [tuple(sorted((overlap, interval[2])))]
+            return _all_overlaps(events, intervals)
+        active.insert(position, interval)
+    return []
+
+
+def _all_overlaps(events, intervals):
+    """
+    Report every pair of overlapping rectangles.
+
+    The intervals are the leaves of a tree ordered by their bottoms,
+    and every node keeps the highest top of the active intervals
+    below it. The intervals met by a new one are the active leaves
+    with the bottom under its top and the top above its bottom,
+    found by descending only into nodes with a high enough top.
+
+    Args:
+        events (list):
+            Sorted sweep events, each given as (x, is_start, interval).
+        intervals (list):
+            Vertical intervals, each given as (bottom, top, position).
+
+    Returns:
+        list of tuple: Pairs (i, k) of the positions of overlapping
+            rectangles with i < k.
+    """
+    intervals = sorted(intervals)
+    bottoms = [interval[0] for interval in intervals]
+    leaf = {interval[2]: i for i, interval in enumerate(intervals)}
+    size = 1
+    while size < len(intervals):
+        size *= 2
+    tree = [-np.inf] * (2 * size)
+
+    pairs = []
+    for _, is_start, (bottom, top, k) in events:
+        if is_start:
+            below = bisect_left(bottoms, top)
+            nodes = [(1, 0, size)]
+            while len(nodes) > 0:
+                node, first, last = nodes.pop()
+                if first >= below or tree[node] <= bottom:
+                    continue
+                if node >= size:
+                    other = intervals[node - size][2]
+                    pairs.append((min(other, k), max(other, k)))
+                    continue
+                middle = (first + last) // 2
+                nodes.append((2 * node, first, middle))
+                nodes.append((2 * node + 1, middle, last))
+        node = size + leaf[k]
+        tree[node] = top if is_start else -np.inf
+        node //= 2
+        while node > 0:
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            node //= 2
+    return sorted(pairs)
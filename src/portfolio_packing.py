@@ -0,0 +1,128 @@
+import time
+from itertools import product
+from multiprocessing import Pool
+from queue import Empty, Queue
+
+import numpy as np
+
+from src.height_search import lower_bound
+from src.steinberg_packing import SteinbergPacking
+
+# Variants of the algorithm raced by default, the ones using both
+# heuristics first, as they usually give the lowest packings.
+VARIANTS = [{'without_gaps': without_gaps,
+             'drop_hanging_element': drop_hanging_element,
+             'tie_break': tie_break}
+            for (without_gaps, drop_hanging_element), tie_break in product(
+                [(True, True), (True, False), (False, True),
+                 (False, False)],
+                ['size', 'reverse', 'index'])]
+
+# The elements of a worker process, sent once for all its variants.
+_worker_instance = None
+
+
+def pack_portfolio(strip_width, elements, budget=None, workers=None,
+                   variants=None, tolerance=1e-9, **options):
+    """
+    Race variants of the Steinberg algorithm in a pool of processes
+    and return the lowest packing found within a time budget.
+
+    The race stops when the budget is spent, when every variant
+    finished, or when a packing reaches the lower bound of the height,
+    which no variant can improve. The variants still running are then
+    terminated. The variants get the end of the budget as their
+    deadline, so they stop with the elements packed by then stacked
+    above the packing. If no variant finished within the budget,
+    the first one to stop is awaited for at most the budget again.
+
+    Args:
+        strip_width (int): The width of the strip for packing.
+        elements (list of lists):
+            Elements to be packed, each given as [width, height].
+        budget (float, optional):
+            Wall-clock time in seconds for the race.
+            Defaults to None, waiting for every variant.
+        workers (int, optional):
+            Number of worker processes.
+            Defaults to the number of processors.
+        variants (list of dict, optional):
+            Keyword arguments of SteinbergPacking for every variant.
+            Defaults to `VARIANTS`.
+        tolerance (float, optional):
+            How close to the lower bound a packing stops the race.
+            Defaults to 1e-9.
+        **options:
+            Keyword arguments of SteinbergPacking shared by
+            the variants, such as `round_value`.
+
+    Returns:
+        tuple: The lowest PackingResult and the keyword arguments
+            of its variant, or (None, None) if no variant succeeded.
+    """
+    variants = VARIANTS if variants is None else variants
+    deadline = None if budget is None else time.monotonic() + budget
+    bound = lower_bound(strip_width, elements)
+    finished = Queue()
+
+    best, best_variant = None, None
+    pool = Pool(workers, initializer=_init_worker,
+                initargs=(strip_width, np.asarray(elements), options))
+    try:
+        for position, variant in enumerate(variants):
+            pool.apply_async(
+                _pack_variant, (position, variant, deadline),
+                callback=finished.put,
+                error_callback=lambda error: finished.put((None, None)))
+        for _ in range(len(variants)):
+            timeout = None
+            if deadline is not None:
+                timeout = max(deadline - time.monotonic(), 0)
+                if best is None:
+                    timeout += budget
+            try:
+                position, result = finished.get(timeout=timeout)
+            except Empty:
+                break
+            if result is not None and (
+                    best is None
+                    or result.max_height() < best.max_height()):
+                best, best_variant = result, variants[position]
+            if best is not None and best.max_height() <= bound + tolerance:
+                break
+    finally:
+        pool.terminate()
+    return best, best_variant
+
+
+def _init_worker(strip_width, elements, options):
+    """
+    Store the instance in a worker process.
+
+    Args:
+        strip_width (int): The width of the strip for packing.
+        elements (numpy.ndarray): Elements to be packed.
+        options (dict): Keyword arguments shared by the variants.
+    """
+    global _worker_instance
+    _worker_instance = (strip_width, elements, options)
+
+
+def _pack_variant(position, variant, deadline=None):
+    """
+    Pack the instance with a variant in a worker process.
+
+    Args:
+        position (int): The position of the variant.
+        variant (dict): Keyword arguments of SteinbergPacking.
+        deadline (float, optional):
+            The `time.monotonic()` value at which the packing stops.
+            Defaults to None.
+
+    Returns:
+        tuple: The position of the variant and its PackingResult,
+            or None if the packing failed.
+    """
+    strip_width, elements, options = _worker_instance
+    packing = SteinbergPacking(strip_width, **options, **variant)
+    return position, packing.get_packing(elements, deadline=deadline)
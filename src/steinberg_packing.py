@@ -1,6 +1,51 @@
-from copy import deepcopy
+import math
+import time
+from bisect import bisect_left, bisect_right
+from multiprocessing import Event, Pool
+from time import perf_counter
 
-from src.strip_packing import StripPacking
+import numpy as np
+
+from src.packing_result import PackingResult
+from src.packing_stats import PackingStats
+from src.packing_validation import find_column_problems
+from src.strip_packing import StripPacking, element_sizes
+
+# The prepared packing of a worker process of the parallel mode.
+_worker_packing = None
+
+
+class _Container:
+    """
+    A container of the recorded decomposition of a packing.
+
+    Attributes:
+        origin (list): The [x, y] coordinates of its bottom-left corner.
+        width (float), height (float): Its sizes in length units.
+        parent (_Container or None): The container it was split from.
+        children (list of _Container): Its sub-containers.
+        own (list of int): Elements placed by its phase.
+        area (float):
+            Total area of the elements packed into it and its
+            sub-containers.
+        max_width (float), max_height (float):
+            Upper bounds of the sides of these elements
+            in length units.
+    """
+
+    __slots__ = ('origin', 'width', 'height', 'parent', 'children', 'own',
+                 'area', 'max_width', 'max_height')
+
+    def __init__(self, origin, width, height, parent):
+        self.origin = origin
+        self.width = width
+        self.height = height
+        self.parent = parent
+        self.children = []
+        self.own = []
+        self.area = 0
+        self.max_width = 0
+        self.max_height = 0
 
 
 class SteinbergPacking(StripPacking):
@@ -17,7 +62,11 @@ class SteinbergPacking(StripPacking):
 
     def __init__(self, strip_width: int,
                  without_gaps=False, drop_hanging_element=False,
-                 round_value=6):
+                 round_value=6, profile=False, profile_callback=None,
+                 fixed_point=False, cache=None, debug=False,
+                 tie_break='size', incremental=False, workers=1,
+                 parallel_threshold=10000, aggregate=False,
+                 aggregate_limit=256):
         """
         Initialize SteinbergPacking class with a given strip width.
 
@@ -32,16 +81,95 @@ class SteinbergPacking(StripPacking):
             round_value (int, optional):
                 Number of decimal places to round heights.
                 Defaults to 6.
+            profile (bool, optional):
+                Whether to collect PackingStats in `self.stats`.
+                Defaults to False.
+            profile_callback (callable, optional):
+                Called with the PackingStats after every packing.
+                Implies `profile`. Defaults to None.
+            fixed_point (bool, optional):
+                Whether to measure the containers in integer units of
+                `10 ** -round_value` and run the algorithm in exact
+                integer arithmetic instead of rounding floats. The
+                sizes of the elements and the strip width must have
+                at most `round_value` decimal places.
+                Defaults to False.
+            cache (PackingCache, optional):
+                The cache of packings looked up by `get_packing`.
+                Defaults to None.
+            debug (bool, optional):
+                Whether to validate the packing after every step,
+                raising AssertionError on a problem.
+                Defaults to False.
+            tie_break (str, optional):
+                How elements of equal width (or height) are ordered:
+                'size' puts the higher (or wider) ones first, 'reverse'
+                the lower (or narrower) ones, and 'index' keeps
+                the input order. Defaults to 'size'.
+            incremental (bool, optional):
+                Whether to record the containers of the packing, which
+                lets `add_elements` and `remove_elements` edit it
+                without packing every element again. Such packings
+                are not looked up in the cache. Defaults to False.
+            workers (int, optional):
+                Number of worker processes packing the parts made by
+                the P3 and Pm3 phases in parallel. With 1, or with
+                profiling or `incremental`, everything is packed in
+                this process. Defaults to 1.
+            parallel_threshold (int, optional):
+                The least number of elements of a part sent to
+                a worker process. Defaults to 10000.
+            aggregate (bool, optional):
+                Whether to group the elements of equal sizes into size
+                classes and to pack every container only once for
+                the same sides and classes of elements, repeating
+                its packing for the other such containers. It requires
+                `fixed_point`, since repeated float coordinates would
+                be rounded differently. Profiled, `incremental` and
+                parallel packings do not aggregate.
+                Defaults to False.
+            aggregate_limit (int, optional):
+                The largest number of elements of a container whose
+                packing is repeated. Defaults to 256.
+
+        Raises:
+            ValueError: If `aggregate` is set without `fixed_point`.
         """
+        if aggregate and not fixed_point:
+            raise ValueError("Aggregation requires fixed_point=True")
         super().__init__(strip_width)
         self.without_gaps = without_gaps
         self.drop_hanging_element = drop_hanging_element
         self.round_value = round_value
-
-    def get_packing(self, elements):
+        self.profile = profile or profile_callback is not None
+        self.profile_callback = profile_callback
+        self.fixed_point = fixed_point
+        self.cache = cache
+        self.debug = debug
+        self.tie_break = tie_break
+        self.incremental = incremental
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.aggregate = aggregate
+        self.aggregate_limit = aggregate_limit
+        self.stats = None
+        self.cut_short = False
+        self.__unprepared = None
+        self.__deadline = None
+        self.__cancel = None
+        self.__root = None
+
+    def get_packing(self, elements, deadline=None, cancel=None):
         """
         Perform the packing algorithm on the given elements.
 
+        The deadline and the cancellation are checked between
+        the containers of the Steinberg algorithm and before every
+        heuristic. If the Steinberg algorithm is stopped, the elements
+        it has not placed yet are packed in shelves above the others,
+        and a stopped heuristic leaves the packing as it was before.
+        Either way the packing stays valid and `self.cut_short` is set.
+
         Args:
             elements (list of lists):
                 A list where each element is a list containing
@@ -51,23 +179,972 @@ class SteinbergPacking(StripPacking):
                 Example:
                     [[width1, height1], [width2, height2], ...]
 
+                It may also be an (n, 2) NumPy array or any object
+                supporting the buffer protocol with this layout,
+                which is used without copying and must not change
+                while the packing is in use.
+            deadline (float, optional):
+                The `time.monotonic()` time to stop packing at.
+                Defaults to None.
+            cancel (threading.Event, optional):
+                An object whose `is_set()` method tells to stop packing,
+                such as `threading.Event`. Defaults to None.
+
         Modifies:
             self.height (int or None):
                 Sets this attribute to the estimated height of
                 the packed elements. If the packing is not feasible,
                 sets `self.height` to None.
-            self.packing (list):
-                Sets this attribute to the final packing configuration
-                after applying the algorithm.
+            self.result (PackingResult or None):
+                Sets this attribute to the final packing, which
+                `self.packing` gives in the list form when used.
+            self.stats (PackingStats or None):
+                Sets this attribute to the statistics of the run
+                if profiling is enabled, or to None if the packing
+                is taken from the cache.
+            self.cut_short (bool):
+                Sets this attribute to whether the packing was stopped
+                by the deadline or the cancellation.
+
+        Returns:
+            PackingResult or None: The final packing in the column
+                form, or None if the packing is not feasible.
+        """
+        self.__deadline = deadline
+        self.__cancel = cancel
+        self.cut_short = False
+        if self.cache is None or self.incremental:
+            return self.__get_packing(elements)
+        options = (self.without_gaps, self.drop_hanging_element,
+                   self.round_value, self.fixed_point, self.tie_break,
+                   self.aggregate)
+        result = self.cache.get(self.width, elements, options)
+        if result is not None:
+            self.result = result
+            self.height = result.height
+            self.stats = None
+            # The sorted orders used by `repack` are computed
+            # only if it is called.
+            self.__unprepared = elements
+            return result
+        result = self.__get_packing(elements)
+        if result is not None and not result.cut_short:
+            self.cache.put(self.width, elements, options, result)
+        return result
+
+    def __get_packing(self, elements):
+        """
+        Perform the packing algorithm on the given elements
+        bypassing the cache.
+
+        Args:
+            elements (list of lists):
+                Elements to be packed, each given as [width, height].
+
+        Returns:
+            PackingResult or None: The final packing in the column
+                form, or None if the packing is not feasible.
+        """
+        self.result = None
+        self.__clear_placements()
+        self.stats = PackingStats() if self.profile else None
+        self.height = None
+        self.__unprepared = None
+
+        if not self.__prepare(elements):
+            return None
+
+        container_height = self.__estimate_height()
+        if container_height is None:
+            print("Packing probem cannot be solved")
+            return None
+        return self.__pack(container_height, False)
+
+    def __estimate_height(self):
+        """
+        Estimate the height of the strip for the packed elements.
+
+        Returns:
+            float or int or None: The estimated height in length units,
+                or None if the packing is not feasible.
+        """
+        packed = slice(None) if self.__count == len(self.__alive) \
+            else self.__alive
+        areas = self.__areas[packed]
+        if areas.dtype.kind == 'f':
+            # The estimate is rounded up, so float areas are summed
+            # one by one in the input order, as they always were,
+            # instead of pairwise, which may differ in the last bit.
+            sum_area = sum(areas.tolist())
+        else:
+            sum_area = areas.sum().item()
+        if self.fixed_point:
+            return self.__fixed_point_height(
+                sum_area * self.__area_unit,
+                self.__widths[packed].max().item(),
+                self.__heights[packed].max().item())
+        max_width = self.__input_widths[packed].max().item()
+        max_height = self.__input_heights[packed].max().item()
+        return self.__float_height(sum_area, max_width, max_height)
+
+    def repack(self, height, deadline=None, cancel=None):
+        """
+        Pack the elements of the last `get_packing` call again
+        into a strip of the given height.
+
+        The sorted orders of the elements are reused. Below the height
+        estimated by `get_packing` the Steinberg algorithm is not
+        guaranteed to succeed, so the packing is checked to hold every
+        element inside the strip without overlaps.
+
+        Args:
+            height (float): The height of the strip.
+            deadline (float, optional):
+                The `time.monotonic()` time to stop packing at,
+                as for `get_packing`. Defaults to None.
+            cancel (threading.Event, optional):
+                An object whose `is_set()` method tells to stop packing,
+                as for `get_packing`. Defaults to None.
+
+        Modifies:
+            self.height (float or None):
+                Sets this attribute to `height`, or to None if
+                the elements cannot be packed into it.
+            self.result (PackingResult or None):
+                Sets this attribute to the packing.
+            self.stats (PackingStats or None):
+                Sets this attribute to the statistics of the run
+                if profiling is enabled.
+            self.cut_short (bool):
+                Sets this attribute to whether the packing was stopped.
+
+        Returns:
+            PackingResult or None: The packing in the column form,
+                or None if the elements cannot be packed this way.
+        """
+        if self.__unprepared is not None:
+            self.__prepare(self.__unprepared)
+            self.__unprepared = None
+        self.__deadline = deadline
+        self.__cancel = cancel
+        self.cut_short = False
+        self.result = None
+        self.__clear_placements()
+        self.stats = PackingStats() if self.profile else None
+        self.height = None
+        if self.fixed_point:
+            height = math.floor(height * self.__unit * self.__scale)
+        return self.__pack(height, True)
+
+    def add_elements(self, elements):
+        """
+        Add elements to a packing made with `incremental=True`.
+
+        The recorded containers are searched for one which still
+        satisfies the condition of the Steinberg algorithm with the new
+        elements added to its own, descending to the smallest such one,
+        and only that container is packed again. Its area is not used
+        by the rest of the packing, so the height of the strip stays
+        the same. If no container can take the new elements, every
+        element is packed again with a new estimate of the height.
+        The heuristics and the conversion to the input units, if
+        chosen, are applied to the whole packing again.
+
+        Args:
+            elements (list of lists or numpy.ndarray):
+                Elements to be added, each given as [width, height],
+                or an (n, 2) array of them. They get the indices
+                following the ones used so far.
+
+        Modifies:
+            self.height (float or None):
+                Sets this attribute to the height of the strip,
+                or to None if the packing failed.
+            self.result (PackingResult or None):
+                Sets this attribute to the packing.
+
+        Returns:
+            PackingResult or None: The packing in the column form,
+                or None if the elements cannot be added.
+        """
+        if not self.__start_edit():
+            return None
+        widths, heights = element_sizes(elements)
+        if len(widths) == 0:
+            return self.__finish_edit()
+        if widths.max() > self.width:
+            print("Packing probem cannot be solved")
+            return None
+        if self.fixed_point and not self.__refine_grid(widths, heights):
+            print("Fixed-point packing requires sizes with at most "
+                  "round_value decimal places")
+            return None
+
+        first = len(self.__input_widths)
+        self.__extend(widths, heights)
+        added = list(range(first, len(self.__input_widths)))
+        area = self.__areas[first:].sum().item()
+        max_width = self.__widths[first:].max().item()
+        max_height = self.__heights[first:].max().item()
+        node = self.__find_container(area, max_width, max_height)
+        if node is None:
+            return self.__repack_all()
+        while True:
+            spare_areas = [self.__spare_area(child, area, max_width,
+                                             max_height)
+                           for child in node.children]
+            fitting = [k for k, spare in enumerate(spare_areas)
+                       if spare is not None]
+            if len(fitting) == 0:
+                break
+            node = node.children[max(fitting,
+                                     key=lambda k: spare_areas[k])]
+        return self.__repack_container(node, added, area, max_width,
+                                       max_height)
+
+    def remove_elements(self, indices):
+        """
+        Remove elements from a packing made with `incremental=True`.
+
+        The other elements keep their places, so the packing stays
+        valid without packing anything again. The heuristics and
+        the conversion to the input units, if chosen, are applied
+        to the whole packing again.
+
+        Args:
+            indices (list of int):
+                Indices of the elements to be removed. The indices of
+                the other elements do not change.
+
+        Modifies:
+            self.height (float or None):
+                Sets this attribute to the height of the strip.
+            self.result (PackingResult or None):
+                Sets this attribute to the packing.
+
+        Returns:
+            PackingResult or None: The packing in the column form,
+                or None if the elements cannot be removed.
+        """
+        if not self.__start_edit():
+            return None
+        indices = np.unique(np.asarray(indices, dtype=np.intp))
+        if len(indices) > 0 and (
+                indices[0] < 0 or indices[-1] >= len(self.__alive)
+                or not self.__alive[indices].all()):
+            print("Removed elements must be packed")
+            return None
+
+        for i in indices.tolist():
+            self.__unplace(i)
+            node = self.__node_of[i]
+            node.own.remove(i)
+            self.__node_of[i] = None
+            area = self.__areas[i].item()
+            while node is not None:
+                node.area -= area
+                node = node.parent
+        self.__alive[indices] = False
+        self.__count -= len(indices)
+        self.__sorted = False
+        return self.__finish_edit()
+
+    def __start_edit(self):
+        """
+        Check that the packing can be edited and reset the state
+        of the last packing.
+
+        Returns:
+            bool: Whether the containers of the packing are recorded.
+        """
+        if self.__root is None:
+            print("Packing cannot be edited. "
+                  "Run \"get_packing\" with incremental=True first")
+            return False
+        self.__deadline = None
+        self.__cancel = None
+        self.cut_short = False
+        self.stats = PackingStats() if self.profile else None
+        return True
+
+    def __finish_edit(self):
+        """
+        Make the edited packing of the Steinberg algorithm the packing
+        of the strip.
+
+        Without the heuristics and the conversion to the input units,
+        the result is taken from the kept positions of the elements
+        in the order of their indices.
+
+        Returns:
+            PackingResult: The packing in the column form.
+        """
+        self.height = self.__root.height
+        heuristics = (self.without_gaps or self.drop_hanging_element
+                      or self.fixed_point)
+        if heuristics or self.debug:
+            self.__publish()
+        if self.debug:
+            self.__assert_valid('edit')
+        if heuristics:
+            return self.__finish()
+        if self.profile_callback is not None:
+            self.profile_callback(self.stats)
+        index = np.flatnonzero(self.__alive)
+        self.result = PackingResult(
+            self.width, self.height, self.__raw_x[index],
+            self.__raw_y[index], self.__input_widths[index],
+            self.__input_heights[index], index)
+        return self.result
+
+    def __keep_placements(self):
+        """
+        Add the elements just placed by the Steinberg algorithm to the
+        record of the packing, keeping their positions by their indices.
+
+        Returns:
+            None
+        """
+        index = self.__packing_index
+        first = len(self.__raw_index)
+        self.__raw_index.extend(index)
+        self.__raw_position[index] = np.arange(first, len(self.__raw_index))
+        self.__raw_x[index] = self.__x
+        self.__raw_y[index] = self.__y
+
+    def __publish(self):
+        """
+        Copy the recorded packing into the placements to be finished,
+        so the heuristics do not change the record.
+
+        Modifies:
+            self.__packing_index (list):
+                Sets this attribute to the recorded elements and
+                `self.__x` and `self.__y` to their coordinates.
+
+        Returns:
+            None
+        """
+        self.__packing_index = list(self.__raw_index)
+        self.__x = self.__raw_x[self.__raw_index].tolist()
+        self.__y = self.__raw_y[self.__raw_index].tolist()
+
+    def __clear_placements(self):
+        """
+        Start new placements of the Steinberg algorithm.
+
+        Modifies:
+            self.__packing_index (list):
+                Empties this attribute and `self.__x` and `self.__y`.
 
         Returns:
             None
         """
-        self.packing = []
+        self.__x = []
+        self.__y = []
+        self.__packing_index = []
+
+    def __extend(self, widths, heights):
+        """
+        Append elements to the prepared ones.
+
+        Args:
+            widths (numpy.ndarray): Widths of the new elements.
+            heights (numpy.ndarray): Heights of the new elements.
+
+        Returns:
+            None
+        """
+        count = len(widths)
+        self.__input_widths = np.concatenate((self.__input_widths, widths))
+        self.__input_heights = np.concatenate((self.__input_heights,
+                                               heights))
+        if self.fixed_point:
+            widths = self.__to_grid(widths)
+            heights = self.__to_grid(heights)
+        self.__areas = np.concatenate((self.__areas, widths * heights))
+        widths = widths * self.__unit
+        heights = heights * self.__unit
+        self.__widths = np.concatenate((self.__widths, widths))
+        self.__heights = np.concatenate((self.__heights, heights))
+        self.__element_widths.extend(widths.tolist())
+        self.__element_heights.extend(heights.tolist())
+        self.__marked = np.concatenate((self.__marked,
+                                        np.zeros(count, dtype=bool)))
+        self.__alive = np.concatenate((self.__alive,
+                                       np.ones(count, dtype=bool)))
+        self.__raw_position = np.concatenate(
+            (self.__raw_position, np.full(count, -1, dtype=np.intp)))
+        self.__raw_x = np.concatenate(
+            (self.__raw_x, np.zeros(count, dtype=self.__raw_x.dtype)))
+        self.__raw_y = np.concatenate(
+            (self.__raw_y, np.zeros(count, dtype=self.__raw_y.dtype)))
+        self.__node_of.extend([None] * count)
+        self.__count += count
+        self.__sorted = False
+
+    def __find_container(self, area, max_width, max_height):
+        """
+        Find a recorded container which can take new elements.
+
+        The containers are searched depth first, skipping the ones
+        smaller than the largest sides of the new elements together
+        with their sub-containers.
+
+        Args:
+            area (float): Total area of the new elements.
+            max_width (float), max_height (float):
+                The largest sides of the new elements in length units.
+
+        Returns:
+            _Container or None: The first container found which
+                satisfies the condition of the Steinberg algorithm,
+                or None if there is none.
+        """
+        nodes = [self.__root]
+        while len(nodes) > 0:
+            node = nodes.pop()
+            if max_width > node.width or max_height > node.height:
+                continue
+            if self.__spare_area(node, area, max_width,
+                                 max_height) is not None:
+                return node
+            nodes.extend(node.children)
+        return None
+
+    def __spare_area(self, node, area, max_width, max_height):
+        """
+        Check the condition of the Steinberg algorithm for packing
+        new elements together with the elements of the container.
+
+        Args:
+            node (_Container): The record of the container.
+            area (float): Total area of the new elements.
+            max_width (float), max_height (float):
+                The largest sides of the new elements in length units.
+
+        Returns:
+            float or None: Twice the area left free by the condition,
+                or None if it does not hold.
+        """
+        max_width = max(max_width, node.max_width)
+        max_height = max(max_height, node.max_height)
+        if max_width > node.width or max_height > node.height:
+            return None
+        spare = (node.width * node.height
+                 - max(2 * max_width - node.width, 0)
+                 * max(2 * max_height - node.height, 0)
+                 - 2 * (node.area + area) * self.__area_unit)
+        return spare if spare >= 0 else None
+
+    def __repack_container(self, node, added, area, max_width,
+                           max_height):
+        """
+        Pack the elements of a recorded container again together with
+        new elements.
+
+        Args:
+            node (_Container): The record of the container.
+            added (list of int): Indices of the new elements.
+            area (float): Total area of the new elements.
+            max_width (float), max_height (float):
+                The largest sides of the new elements in length units.
+
+        Returns:
+            PackingResult or None: The packing in the column form,
+                or None if the packing failed.
+        """
+        indices = list(added)
+        nodes = [node]
+        while len(nodes) > 0:
+            current = nodes.pop()
+            indices.extend(current.own)
+            nodes.extend(current.children)
+        for i in indices[len(added):]:
+            self.__unplace(i)
+
+        by_width, by_height = self.__orders(
+            np.sort(np.array(indices, dtype=np.intp)))
+        self.__clear_placements()
+        self.__steinberg(node.origin, node.width, node.height,
+                         by_width, by_height, node)
+        self.__keep_placements()
+        if len(self.__packing_index) != len(indices):
+            return self.__repack_all()
+
+        node = node.parent
+        while node is not None:
+            node.area += area
+            node.max_width = max(node.max_width, max_width)
+            node.max_height = max(node.max_height, max_height)
+            node = node.parent
+        return self.__finish_edit()
+
+    def __repack_all(self):
+        """
+        Pack every element again with a new estimate of the height.
 
-        sum_area = sum(el[0]*el[1] for el in elements)
-        max_width = max(el[0] for el in elements)
-        max_height = max(el[1] for el in elements)
+        Returns:
+            PackingResult or None: The packing in the column form,
+                or None if the packing is not feasible.
+        """
+        self.result = None
+        self.__clear_placements()
+        container_height = self.__estimate_height()
+        if container_height is None:
+            print("Packing probem cannot be solved")
+            self.height = None
+            self.__root = None
+            return None
+        return self.__pack(container_height, False)
+
+    def __unplace(self, index):
+        """
+        Remove an element from the packing of the recorded containers,
+        moving the last placement into its place.
+
+        Args:
+            index (int): Index of the element.
+
+        Returns:
+            None
+        """
+        position = self.__raw_position[index]
+        moved = self.__raw_index[-1]
+        self.__raw_index[position] = moved
+        self.__raw_position[moved] = position
+        self.__raw_index.pop()
+        self.__raw_position[index] = -1
+
+    def __prepare(self, elements):
+        """
+        Store the sizes and the sorted orders of the elements.
+
+        Args:
+            elements (list of lists or numpy.ndarray):
+                Elements to be packed, each given as [width, height],
+                or an (n, 2) array of them.
+
+        Returns:
+            bool: Whether the elements can be packed in the chosen
+                arithmetic.
+        """
+        widths, heights = element_sizes(elements)
+        self.__input_widths = widths
+        self.__input_heights = heights
+        self.__width = self.width
+        self.__scale = 1
+        self.__unit = 1
+        if self.fixed_point:
+            scales = [self.__grid_scale(sizes) for sizes
+                      in (np.asarray(self.width), widths, heights)]
+            if None in scales:
+                print("Fixed-point packing requires sizes with at most "
+                      "round_value decimal places")
+                return False
+            # Lengths are measured in units of 10 ** -round_value,
+            # while areas are measured in the units of the grid
+            # making the sizes integers, which is the input unit
+            # for integer sizes.
+            self.__scale = max(scales)
+            self.__unit = 10 ** self.round_value // self.__scale
+            self.__width = self.__to_grid(np.asarray(self.width)).item()
+            widths = self.__to_grid(widths)
+            heights = self.__to_grid(heights)
+            self.__widths = widths * self.__unit
+            self.__heights = heights * self.__unit
+        else:
+            self.__widths = widths
+            self.__heights = heights
+        self.__area_unit = self.__unit ** 2
+        # The phases read single sizes, which is faster from lists.
+        self.__element_widths = self.__widths.tolist()
+        self.__element_heights = self.__heights.tolist()
+        self.__areas = widths * heights
+        self.__marked = np.zeros(len(widths), dtype=bool)
+        self.__alive = np.ones(len(widths), dtype=bool)
+        self.__count = len(widths)
+        self.__sorted = True
+        self.__by_width, self.__by_height = self.__orders(
+            np.arange(len(widths)))
+        self.__classes = None
+        if self.aggregate and self.fixed_point:
+            classes = self.__size_classes(widths, heights)
+            # Without equal sizes no container can be repeated.
+            if len(classes) > 0 and classes.max() < len(classes) - 1:
+                self.__classes = classes
+        self.__root = None
+        return True
+
+    def __grid_scale(self, sizes):
+        """
+        Find the power of ten making the sizes integers.
+
+        Args:
+            sizes (numpy.ndarray): Sizes in the input units.
+
+        Returns:
+            int or None: The smallest `10 ** k` with `k` not greater
+                than `round_value` such that the sizes multiplied by it
+                are integers up to the error of floats, or None if
+                there is no such power.
+        """
+        if sizes.dtype.kind in 'iu':
+            return 1
+        for k in range(self.round_value + 1):
+            scaled = sizes * 10 ** k
+            if np.allclose(scaled, np.rint(scaled), rtol=1e-9, atol=0):
+                return 10 ** k
+        return None
+
+    def __to_grid(self, sizes):
+        """
+        Convert sizes from the input units to the units of the grid.
+
+        Args:
+            sizes (numpy.ndarray): Sizes in the input units.
+
+        Returns:
+            numpy.ndarray: The sizes as integers, the integer sizes
+                given at the scale of the input as they are.
+        """
+        if sizes.dtype.kind in 'iu' and self.__scale == 1:
+            return sizes
+        return np.rint(sizes * self.__scale).astype(np.int64)
+
+    def __refine_grid(self, widths, heights):
+        """
+        Make the grid fine enough for the sizes of new elements.
+
+        The length unit does not change, so only the areas and the
+        width of the strip measured in the units of the grid are
+        converted.
+
+        Args:
+            widths (numpy.ndarray), heights (numpy.ndarray):
+                Sizes of the new elements in the input units.
+
+        Returns:
+            bool: Whether the sizes have at most `round_value`
+                decimal places.
+        """
+        scales = [self.__grid_scale(widths), self.__grid_scale(heights)]
+        if None in scales:
+            return False
+        scale = max(scales)
+        if scale <= self.__scale:
+            return True
+        factor = scale // self.__scale
+        self.__scale = scale
+        self.__unit //= factor
+        self.__area_unit = self.__unit ** 2
+        self.__width *= factor
+        self.__areas = self.__areas.astype(np.int64) * factor ** 2
+        nodes = [] if self.__root is None else [self.__root]
+        while len(nodes) > 0:
+            node = nodes.pop()
+            node.area *= factor ** 2
+            nodes.extend(node.children)
+        return True
+
+    @staticmethod
+    def __size_classes(widths, heights):
+        """
+        Number the distinct sizes of the elements.
+
+        Args:
+            widths (numpy.ndarray), heights (numpy.ndarray):
+                Sizes of the elements.
+
+        Returns:
+            numpy.ndarray: The size class of every element, equal
+                for the elements of equal widths and heights.
+        """
+        order = np.lexsort((heights, widths))
+        new = np.empty(len(order), dtype=bool)
+        new[:1] = True
+        new[1:] = ((widths[order[1:]] != widths[order[:-1]])
+                   | (heights[order[1:]] != heights[order[:-1]]))
+        classes = np.empty(len(order), dtype=np.int32)
+        classes[order] = np.cumsum(new) - 1
+        return classes
+
+    def __orders(self, indices):
+        """
+        Sort the elements by decreasing width and by decreasing height.
+
+        Args:
+            indices (numpy.ndarray):
+                Indices of the elements in increasing order.
+
+        Returns:
+            tuple: The indices ordered by width and by height, with
+                ties broken as chosen by `tie_break`.
+        """
+        widths = self.__input_widths[indices]
+        heights = self.__input_heights[indices]
+        if self.tie_break == 'index':
+            return (indices[np.argsort(-widths, kind='stable')],
+                    indices[np.argsort(-heights, kind='stable')])
+        if self.tie_break == 'reverse':
+            return (indices[np.lexsort((heights, -widths))],
+                    indices[np.lexsort((widths, -heights))])
+        return (indices[np.lexsort((-heights, -widths))],
+                indices[np.lexsort((-widths, -heights))])
+
+    def __root_orders(self):
+        """
+        Get the orders of the packed elements, sorting them again
+        if elements were added or removed since the last sort.
+
+        Returns:
+            tuple: Indices of the packed elements ordered by decreasing
+                width and by decreasing height.
+        """
+        if not self.__sorted:
+            self.__by_width, self.__by_height = self.__orders(
+                np.flatnonzero(self.__alive))
+            self.__sorted = True
+        return self.__by_width, self.__by_height
+
+    def __pack(self, container_height, check):
+        """
+        Pack the prepared elements into a strip of the given height
+        and apply the heuristics.
+
+        Args:
+            container_height (float):
+                The height of the strip in length units.
+            check (bool):
+                Whether to check that the Steinberg algorithm packed
+                every element inside the strip without overlaps.
+
+        Modifies:
+            self.height (float or None):
+                Sets this attribute to the height of the strip,
+                or to None if the packing failed.
+            self.result (PackingResult or None):
+                Sets this attribute to the packing.
+
+        Returns:
+            PackingResult or None: The packing in the column form,
+                or None if the packing failed.
+        """
+        self.height = container_height
+        self.__root = None
+        if self.incremental:
+            self.__root = _Container([0, 0], self.__width * self.__unit,
+                                     container_height, None)
+            self.__node_of = [None] * len(self.__element_widths)
+        self.__run_step('steinberg', self.__steinberg,
+                        [0, 0], self.__width * self.__unit, container_height,
+                        *self.__root_orders(), self.__root)
+        if self.cut_short:
+            self.__run_step('stack_remaining', self.__stack_remaining)
+
+        if check and not self.__fits(container_height):
+            self.__clear_placements()
+        elif len(self.__packing_index) == 0:
+            print("Steinberg algorithm failed")
+        if len(self.__packing_index) == 0:
+            self.height = None
+        elif self.debug:
+            self.__assert_valid('steinberg')
+        if self.height is None or self.cut_short:
+            self.__root = None
+        elif self.__root is not None:
+            count = len(self.__element_widths)
+            dtype = np.int64 if self.fixed_point else float
+            self.__raw_index = []
+            self.__raw_position = np.full(count, -1, dtype=np.intp)
+            self.__raw_x = np.zeros(count, dtype=dtype)
+            self.__raw_y = np.zeros(count, dtype=dtype)
+            self.__keep_placements()
+        return self.__finish()
+
+    def __finish(self):
+        """
+        Apply the heuristics to the packing made by the Steinberg
+        algorithm and convert it to the input units.
+
+        Modifies:
+            self.height (float or None):
+                Converts this attribute to the input units.
+            self.result (PackingResult or None):
+                Sets this attribute to the final packing.
+
+        Returns:
+            PackingResult or None: The packing in the column form,
+                or None if the packing failed.
+        """
+        if (self.height is not None and self.without_gaps
+                and not self.__interrupted()):
+            self.__run_step('remove_gaps', self.__remove_gaps)
+            if self.debug:
+                self.__assert_valid('remove_gaps')
+        if (self.height is not None and self.drop_hanging_element
+                and not self.__interrupted()):
+            self.__run_step('drop_hanging_elements',
+                            self.__drop_hanging_elements)
+            if self.debug:
+                self.__assert_valid('drop_hanging_elements')
+
+        x = np.array(self.__x)
+        y = np.array(self.__y)
+        if self.fixed_point:
+            length_unit = self.__unit * self.__scale
+            x = x / length_unit
+            y = y / length_unit
+            if self.height is not None:
+                self.height = self.height / length_unit
+
+        if self.profile_callback is not None:
+            self.profile_callback(self.stats)
+        if self.height is None:
+            return None
+        index = np.array(self.__packing_index, dtype=np.intp)
+        self.result = PackingResult(
+            self.width, self.height, x, y,
+            self.__input_widths[index], self.__input_heights[index],
+            index, self.cut_short)
+        return self.result
+
+    def __interrupted(self):
+        """
+        Check whether the deadline has passed or the packing
+        has been cancelled.
+
+        Modifies:
+            self.cut_short (bool):
+                Sets this attribute to True if so.
+
+        Returns:
+            bool: Whether packing must stop.
+        """
+        if ((self.__deadline is not None
+             and time.monotonic() >= self.__deadline)
+                or (self.__cancel is not None and self.__cancel.is_set())):
+            self.cut_short = True
+        return self.cut_short
+
+    def __stack_remaining(self):
+        """
+        Pack the elements left by the stopped Steinberg algorithm
+        in shelves above the packing, the highest elements first.
+
+        Modifies:
+            self.__packing_index (list):
+                Appends the packed elements to this attribute and
+                their coordinates to `self.__x` and `self.__y`.
+            self.height (float):
+                Raises this attribute to the top of the shelves.
+
+        Returns:
+            None
+        """
+        placed = np.zeros(len(self.__element_widths), dtype=bool)
+        placed[self.__packing_index] = True
+        width = self.__width * self.__unit
+        shelf_bottom = shelf_top = max(
+            (el_y + self.__element_heights[i]
+             for el_y, i in zip(self.__y, self.__packing_index)),
+            default=0)
+        element_x = width
+        by_height = self.__root_orders()[1]
+        for i in by_height[~placed[by_height]].tolist():
+            if element_x + self.__element_widths[i] > width:
+                shelf_bottom = shelf_top
+                shelf_top += self.__element_heights[i]
+                element_x = 0
+            self.__place(i, element_x, shelf_bottom)
+            element_x += self.__element_widths[i]
+        self.height = max(self.height, shelf_top)
+
+    def validate(self, elements=None, tolerance=None):
+        """
+        Check the packing for overlapping elements, elements outside
+        the strip and elements packed a wrong number of times.
+
+        Args:
+            elements (list of lists, optional):
+                Elements which must be packed, each given as
+                [width, height]. Defaults to None, skipping the check.
+            tolerance (float, optional):
+                Overlaps and protrusions not longer than the tolerance
+                are ignored. Defaults to `10 ** -round_value`, as the
+                coordinates are rounded floats even in the fixed-point
+                mode.
+
+        Returns:
+            list of tuple: The problems as described in
+                `StripPacking.validate`.
+        """
+        if tolerance is None:
+            tolerance = 10 ** -self.round_value
+        return super().validate(elements, tolerance)
+
+    def __tolerance(self):
+        """
+        Get the length of overlaps caused by rounding.
+
+        Returns:
+            float: `10 ** -round_value`, or 0 in the fixed-point mode.
+        """
+        return 0 if self.fixed_point else 10 ** -self.round_value
+
+    def __fits(self, container_height):
+        """
+        Check that the packing holds every element inside the strip
+        without overlaps.
+
+        Args:
+            container_height (float):
+                The height of the strip in length units.
+
+        Returns:
+            bool: Whether the packing is valid.
+        """
+        if len(self.__packing_index) != self.__count:
+            return False
+        index = self.__packing_index
+        return len(find_column_problems(
+            self.__x, self.__y, self.__widths[index], self.__heights[index],
+            self.__width * self.__unit, container_height,
+            tolerance=self.__tolerance(), first_only=True)) == 0
+
+    def __assert_valid(self, step):
+        """
+        Validate the packing after a step.
+
+        Args:
+            step (str): The name of the step.
+
+        Raises:
+            AssertionError: If the packing has a problem.
+        """
+        index = self.__packing_index
+        problems = find_column_problems(
+            self.__x, self.__y, self.__widths[index], self.__heights[index],
+            self.__width * self.__unit, self.height,
+            np.column_stack((self.__widths, self.__heights))[self.__alive],
+            self.__tolerance())
+        if len(problems) > 0:
+            raise AssertionError("Invalid packing after {}: {}".format(
+                step, problems[:10]))
+
+    def __float_height(self, sum_area, max_width, max_height):
+        """
+        Estimate the height of the strip in rounded floats.
+
+        Args:
+            sum_area (float): Total area of the elements.
+            max_width (float): Width of the widest element.
+            max_height (float): Height of the highest element.
+
+        Returns:
+            float or None: The estimated height, or None if the packing
+                is not feasible.
+        """
         estimate_height = (
             (sum_area
              + 4*max_width*max_height
@@ -76,139 +1153,167 @@ class SteinbergPacking(StripPacking):
                 and sum_area <= max_height * self.width)
             else 2*sum_area / self.width
         )
-        self.height = max(max_height,
-                          round(estimate_height, self.round_value)
-                          + (self.round_value
-                             if (round(estimate_height, self.round_value)
-                                 < estimate_height)
-                             else 0)
-                          )
+        height = max(max_height,
+                     round(estimate_height, self.round_value)
+                     + (self.round_value
+                        if (round(estimate_height, self.round_value)
+                            < estimate_height)
+                        else 0)
+                     )
 
         if (max_width > self.width or
-                max_height > self.height or
-                2 * sum_area > round(self.width * self.height
+                max_height > height or
+                2 * sum_area > round(self.width * height
                                      - max(2 * max_width - self.width, 0)
-                                     * max(2 * max_height - self.height, 0),
+                                     * max(2 * max_height - height, 0),
                                      self.round_value)):
-            print("Packing probem cannot be solved")
-            self.height = None
-            return
+            return None
+        return height
 
-        self.__steinberg([0, 0], self.width, self.height,
-                         deepcopy(elements))
+    def __fixed_point_height(self, sum_area, max_width, max_height):
+        """
+        Estimate the height of the strip in exact integer arithmetic.
 
-        if len(self.packing) == 0:
-            self.height = None
-            print("Steinberg algorithm failed")
+        The estimate is rounded up to a whole number of length units.
 
-        if self.without_gaps:
-            self.__remove_gaps()
-        if self.drop_hanging_element:
-            self.__drop_hanging_elements()
+        Args:
+            sum_area (int): Total area of the elements in square
+                length units.
+            max_width (int): Width of the widest element in length
+                units.
+            max_height (int): Height of the highest element in length
+                units.
+
+        Returns:
+            int or None: The estimated height in length units, or None
+                if the packing is not feasible.
+        """
+        width = self.__width * self.__unit
+        if (2 * max_width >= width
+                and sum_area <= max_height * width):
+            numerator = (sum_area + 4*max_width*max_height
+                         - max_height*width)
+            denominator = 2 * max_width
+        else:
+            numerator = 2 * sum_area
+            denominator = width
+        height = max(max_height, -(-numerator // denominator))
+
+        if (max_width > width or
+                2 * sum_area
+                > width * height
+                - max(2 * max_width - width, 0)
+                * max(2 * max_height - height, 0)):
+            return None
+        return height
+
+    def __run_step(self, step, method, *args):
+        """
+        Run a step of the packing, timing it if profiling is enabled.
+
+        Args:
+            step (str): The name of the step in the statistics.
+            method (callable): The method performing the step.
+            *args: Arguments of the method.
+
+        Returns:
+            None
+        """
+        if self.stats is None:
+            method(*args)
+            return
+        start = perf_counter()
+        method(*args)
+        self.stats.add_step(step, perf_counter() - start)
 
     def __remove_gaps(self):
         """
         Remove gaps between packed elements in the packing.
 
+        The vertical intervals of the elements are swept in the order
+        of their bottoms. Overlapping or touching intervals form one
+        component, and every element is moved down by the total height
+        of the gaps below its component.
+
         Modifies:
-            self.packing (list):
-                Sets this attribute to the packing configuration
-                after gaps removal.
+            self.__y (list):
+                Lowers the packed elements in this attribute.
 
         Returns:
             None
         """
-        if len(self.packing) == 0:
-            return
-
-        components = [
-            [[packing_el],
-             packing_el[0][1],
-             packing_el[0][1] + packing_el[1][1]
-             ]
-            for packing_el in self.packing
-        ]
-
-        merged = True
-        while merged:
-            merged = False
-            current_count = len(components)
-            for i in range(current_count):
-                if merged:
-                    break
-                for j in range(current_count):
-                    if i == j:
-                        continue
-                    if components[j][1] \
-                            <= components[i][1] \
-                            <= components[j][2] or \
-                            components[j][1] \
-                            <= components[i][2] \
-                            <= components[j][2]:
-                        components[i][0] = deepcopy(components[i][0]
-                                                    + components[j][0])
-                        components[i][1] = min(components[i][1],
-                                               components[j][1])
-                        components[i][2] = max(components[i][2],
-                                               components[j][2])
-                        del components[j]
-                        merged = True
-                        break
-
-        components.sort(key=lambda x: x[1])
-        gaps = []
-        for i in range(len(components)):
-            gaps.append((0 if i == 0 else gaps[i - 1])
-                        + components[i][1]
-                        - (0 if i == 0 else components[i - 1][2]))
-        self.packing = [
-            [[packing_el[0][0], packing_el[0][1] - gaps[i]], packing_el[1]]
-            for i in range(len(components))
-            for packing_el in components[i][0]
-        ]
+        y = self.__y
+        gap = 0
+        component_top = 0
+        for k in sorted(range(len(y)), key=y.__getitem__):
+            if y[k] > component_top:
+                gap = gap + y[k] - component_top
+            component_top = max(
+                component_top,
+                y[k] + self.__element_heights[self.__packing_index[k]])
+            y[k] -= gap
 
     def __drop_hanging_elements(self):
         """
         Drop hanging elements from the packing.
 
+        Elements are settled once each, in the order of their bottoms.
+        The skyline of the settled elements is kept as a list of
+        breakpoints along the strip with the top of the highest element
+        after each breakpoint. An element drops onto the highest part
+        of the skyline under it and then replaces that part by its own
+        top. Every query visits only segments which the following
+        assignment removes, so a drop costs O(log n) amortized.
+        Horizontal overlaps shorter than the rounding precision
+        are ignored.
+
         Modifies:
-            self.packing (list):
-                Sets this attribute to the packing configuration
-                after hanging elements drop.
+            self.__packing_index (list):
+                Sorts this attribute and `self.__x` by the bottoms of
+                the elements, and drops the elements in `self.__y`.
 
         Returns:
             None
         """
-        self.packing.sort(key=lambda x: x[0][1])
-        one_falls = True
-        while one_falls:
-            one_falls = False
-            for i in range(len(self.packing)):
-                y_max = 0
-                for j in range(len(self.packing)):
-                    if i != j and\
-                            min(self.packing[i][0][0]
-                                + self.packing[i][1][0],
-                                self.packing[j][0][0]
-                                + self.packing[j][1][0]
-                                ) \
-                            - max(self.packing[i][0][0],
-                                  self.packing[j][0][0]) > 0 and \
-                            self.packing[j][0][1] \
-                            + self.packing[j][1][1] \
-                            <= self.packing[i][0][1]:
-                        y_max = max(self.packing[j][0][1]
-                                    + self.packing[j][1][1],
-                                    y_max)
-                if y_max != self.packing[i][0][1]:
-                    self.packing[i][0][1] = y_max
-                    one_falls = True
+        order = sorted(range(len(self.__y)), key=self.__y.__getitem__)
+        self.__x = [self.__x[k] for k in order]
+        self.__y = y = [self.__y[k] for k in order]
+        self.__packing_index = [self.__packing_index[k] for k in order]
+        skyline_x = [0]
+        skyline_top = [0]
+        for k, (left, i) in enumerate(zip(self.__x,
+                                          self.__packing_index)):
+            # Side by side elements may overlap by a rounding error,
+            # which must not make one of them rest on the other.
+            right = left + self.__element_widths[i] - self.__tolerance()
+            if right <= left:
+                y[k] = 0
+                continue
+            first = bisect_right(skyline_x, left) - 1
+            last = bisect_left(skyline_x, right)
+            y[k] = max(skyline_top[first:last])
+
+            new_x = [left]
+            new_top = [y[k] + self.__element_heights[i]]
+            if last == len(skyline_x) or skyline_x[last] != right:
+                new_x.append(right)
+                new_top.append(skyline_top[last - 1])
+            if skyline_x[first] < left:
+                first += 1
+            skyline_x[first:last] = new_x
+            skyline_top[first:last] = new_top
 
     def __steinberg(self, container_origin, container_width,
-                    container_height, remained_elements):
+                    container_height, by_width, by_height, node=None):
         """
-        Implement the Steinberg packing algorithm
-        for the container recursively.
+        Implement the Steinberg packing algorithm for the container.
+
+        Containers waiting to be packed are kept on an explicit stack
+        instead of the call stack, so the number of elements is not
+        limited by the recursion depth. Sub-containers are pushed in
+        reverse order, which keeps the order of placements the same
+        as in the depth-first recursion. The loop stops early when
+        the deadline passes or the packing is cancelled.
 
         Args:
             container_origin (list):
@@ -218,114 +1323,697 @@ class SteinbergPacking(StripPacking):
                 Width of the container.
             container_height (float):
                 Height of the container.
-            remained_elements (list):
-                A list of elements remaining to be packed,
-                where each element is [width, height].
+            by_width (numpy.ndarray):
+                Indices of the elements remaining to be packed,
+                ordered by decreasing width.
+            by_height (numpy.ndarray):
+                Indices of the same elements,
+                ordered by decreasing height.
+            node (_Container, optional):
+                The record of the container, which receives the records
+                of its sub-containers. Defaults to None, recording
+                nothing.
 
         Returns:
             None
         """
-        if len(remained_elements) == 0:
+        containers = [[container_origin, container_width,
+                       container_height, by_width, by_height]]
+        if self.stats is not None or node is not None:
+            self.__steinberg_tracked(containers, node)
             return
-
-        remained_elements.sort(key=lambda x: x[0], reverse=True)
-        if remained_elements[0][0] >= container_width / 2:
-            self.__p1(container_origin, container_width,
-                      container_height, remained_elements)
+        if (self.workers > 1
+                and len(by_width) >= 2 * self.parallel_threshold):
+            self.__steinberg_parallel(containers)
+            return
+        if self.__classes is not None:
+            self.__steinberg_aggregated(containers)
             return
+        interruptible = (self.__deadline is not None
+                         or self.__cancel is not None)
+        while len(containers) > 0:
+            if interruptible and self.__interrupted():
+                return
+            phase = self.__choose_phase(*containers.pop())
+            if phase is not None:
+                containers.extend(reversed(phase[0](*phase[1])))
+
+    def __steinberg_aggregated(self, containers):
+        """
+        Implement the Steinberg packing algorithm for the container
+        repeating the packings of equal containers.
+
+        The phases depend only on the sides of a container and on the
+        sizes of its elements in both orders, and the elements of equal
+        sizes come in the same order in both. So a container with the
+        same sides and the same size classes in both orders as one
+        packed before is packed in the same way: the element at every
+        position of `by_width` goes where the element at that position
+        went there. After a container of at most `aggregate_limit`
+        elements, a marker is pushed, and when it is reached, the
+        packing of the container is kept for the equal containers.
+
+        Args:
+            containers (list):
+                The container to pack, given as
+                [origin, width, height, by_width, by_height].
+
+        Modifies:
+            self.__packing_index (list):
+                Appends the packed elements to this attribute and
+                their coordinates to `self.__x` and `self.__y`.
+
+        Returns:
+            None
+        """
+        interruptible = (self.__deadline is not None
+                         or self.__cancel is not None)
+        classes = self.__classes
+        positions = np.empty(len(classes), dtype=np.intp)
+        packings = {}
+        while len(containers) > 0:
+            if interruptible and self.__interrupted():
+                return
+            container = containers.pop()
+            if not isinstance(container, list):
+                key, first, origin, by_width = container
+                positions[by_width] = np.arange(len(by_width))
+                packings[key] = (
+                    positions[self.__packing_index[first:]],
+                    [el_x - origin[0] for el_x in self.__x[first:]],
+                    [el_y - origin[1] for el_y in self.__y[first:]])
+                continue
+            origin, width, height, by_width, by_height = container
+            if 0 < len(by_width) <= self.aggregate_limit:
+                key = (width, height, classes[by_width].tobytes(),
+                       classes[by_height].tobytes())
+                packing = packings.get(key)
+                if packing is not None:
+                    self.__repeat(origin, by_width, *packing)
+                    continue
+                containers.append((key, len(self.__packing_index), origin,
+                                   by_width))
+            phase = self.__choose_phase(*container)
+            if phase is not None:
+                containers.extend(reversed(phase[0](*phase[1])))
+
+    def __repeat(self, origin, by_width, positions, x, y):
+        """
+        Place the elements of a container as in an equal container
+        packed before.
+
+        Args:
+            origin (list):
+                The [x, y] coordinates of the bottom-left corner
+                of the container.
+            by_width (numpy.ndarray):
+                Indices of the elements of the container,
+                ordered by decreasing width.
+            positions (numpy.ndarray):
+                Positions in `by_width` of the elements in the order
+                of their placement.
+            x (list), y (list):
+                Coordinates of the elements relative to the origin.
+
+        Modifies:
+            self.__packing_index (list):
+                Appends the placed elements to this attribute and
+                their coordinates to `self.__x` and `self.__y`.
+
+        Returns:
+            None
+        """
+        for i, element_x, element_y in zip(by_width[positions].tolist(),
+                                           x, y):
+            self.__place(i, origin[0] + element_x, origin[1] + element_y)
+
+    def __steinberg_parallel(self, containers):
+        """
+        Implement the Steinberg packing algorithm for the container
+        packing large parts in a pool of processes.
+
+        The parts made by the P3 and Pm3 phases share neither elements
+        nor area. A part with at least `parallel_threshold` elements,
+        but not more than an equal share of every worker, is sent to
+        a worker process as soon as it is made, and its place in the
+        stack is taken by a marker. When the marker is reached, the
+        position of the part in the packing is recorded, and the
+        placements of the worker are inserted there at the end, so
+        the packing is the same as without the workers. Larger parts
+        are split further in this process.
+
+        The workers get the deadline and an event set when this process
+        stops, so they stop as well, and the parts not finished by then
+        are left to `__stack_remaining`.
+
+        Args:
+            containers (list):
+                The container to pack, given as
+                [origin, width, height, by_width, by_height].
+
+        Modifies:
+            self.__packing_index (list):
+                Appends the packed elements to this attribute and
+                their coordinates to `self.__x` and `self.__y`.
+
+        Returns:
+            None
+        """
+        largest = max(self.parallel_threshold,
+                      len(containers[0][3]) // self.workers)
+        interruptible = (self.__deadline is not None
+                         or self.__cancel is not None)
+        parts = []
+        stop = Event()
+        pool = Pool(self.workers, initializer=_init_worker,
+                    initargs=(self.__worker_packing(stop),))
+        try:
+            while len(containers) > 0:
+                if interruptible and self.__interrupted():
+                    break
+                container = containers.pop()
+                if not isinstance(container, list):
+                    parts.append((len(self.__packing_index), container))
+                    continue
+                phase = self.__choose_phase(*container)
+                if phase is None:
+                    continue
+                sub_containers = phase[0](*phase[1])
+                if phase[0] == self.__p3 or phase[0] == self.__pm3:
+                    sub_containers = [
+                        pool.apply_async(_pack_part, (sub_container,))
+                        if (self.parallel_threshold
+                            <= len(sub_container[3]) <= largest)
+                        else sub_container
+                        for sub_container in sub_containers]
+                containers.extend(reversed(sub_containers))
+            self.__merge_parts(parts)
+        finally:
+            stop.set()
+            pool.terminate()
+
+    def __merge_parts(self, parts):
+        """
+        Insert the placements of the parts packed by the workers.
+
+        The parts are waited for until the deadline passes or the
+        packing is cancelled. Then the parts not finished yet are
+        left out.
+
+        Args:
+            parts (list):
+                Pairs of the position of a part in the packing and
+                the result of its worker.
+
+        Modifies:
+            self.__packing_index (list):
+                Inserts the elements of the parts into this attribute
+                and their coordinates into `self.__x` and `self.__y`.
+
+        Returns:
+            None
+        """
+        placements = ([], [], [])
+        first = 0
+        for position, part in parts:
+            for column, own in zip(placements, (self.__x, self.__y,
+                                                self.__packing_index)):
+                column.extend(own[first:position])
+            first = position
+            if not self.__wait(part):
+                continue
+            *part_placements, cut_short = part.get()
+            self.cut_short = self.cut_short or cut_short
+            for column, part_column in zip(placements, part_placements):
+                column.extend(part_column)
+        for column, own in zip(placements, (self.__x, self.__y,
+                                            self.__packing_index)):
+            column.extend(own[first:])
+        self.__x, self.__y, self.__packing_index = placements
+
+    def __wait(self, part):
+        """
+        Wait for a part packed by a worker until the deadline passes
+        or the packing is cancelled.
+
+        Args:
+            part (multiprocessing.pool.AsyncResult):
+                The result of the worker.
+
+        Modifies:
+            self.cut_short (bool):
+                Sets this attribute to True if the packing is stopped.
+
+        Returns:
+            bool: Whether the part is finished.
+        """
+        while not part.ready() and not self.__interrupted():
+            timeout = None
+            if self.__deadline is not None:
+                timeout = max(self.__deadline - time.monotonic(), 0)
+            if self.__cancel is not None:
+                # The cancellation cannot wake this process up,
+                # so it is polled.
+                timeout = 0.05 if timeout is None else min(timeout, 0.05)
+            part.wait(timeout)
+        return part.ready()
+
+    def __worker_packing(self, stop):
+        """
+        Copy the prepared elements into a new packing for the worker
+        processes, leaving out what they do not need.
+
+        Args:
+            stop (multiprocessing.Event):
+                The event stopping the workers.
+
+        Returns:
+            SteinbergPacking: The packing to be sent to the workers.
+        """
+        packing = SteinbergPacking(self.width, round_value=self.round_value,
+                                   fixed_point=self.fixed_point,
+                                   tie_break=self.tie_break)
+        packing.__unit = self.__unit
+        packing.__area_unit = self.__area_unit
+        packing.__widths = self.__widths
+        packing.__heights = self.__heights
+        packing.__areas = self.__areas
+        packing.__marked = self.__marked
+        packing.__count = self.__count
+        packing.__classes = None
+        packing.__element_widths = None
+        packing.__deadline = self.__deadline
+        packing.__cancel = stop
+        return packing
+
+    def _pack_part(self, container):
+        """
+        Pack a part in a worker process of the parallel mode.
+
+        Args:
+            container (list):
+                The part, given as
+                [origin, width, height, by_width, by_height].
+
+        Returns:
+            tuple: The x and y coordinates of the placed elements,
+                their indices and whether the part was stopped by the
+                deadline or by the event of `__worker_packing`.
+        """
+        if self.__element_widths is None:
+            self.__element_widths = self.__widths.tolist()
+            self.__element_heights = self.__heights.tolist()
+        self.__clear_placements()
+        self.cut_short = False
+        self.__steinberg(*container)
+        return self.__x, self.__y, self.__packing_index, self.cut_short
+
+    def __steinberg_tracked(self, containers, node):
+        """
+        Implement the Steinberg packing algorithm for the container
+        recording the statistics of every container, the decomposition
+        into containers, or both.
+
+        Args:
+            containers (list):
+                The container to pack, given as
+                [origin, width, height, by_width, by_height].
+            node (_Container or None):
+                The record of the container, or None to record
+                no decomposition.
+
+        Modifies:
+            self.stats (PackingStats or None):
+                Records the phases, depths and times of the containers.
+            node (_Container or None):
+                Records the sub-containers and the placed elements.
+
+        Returns:
+            None
+        """
+        depths = [0]
+        nodes = [node]
+        start = 0
+        while len(containers) > 0:
+            if self.__interrupted():
+                return
+            depth = depths.pop()
+            node = nodes.pop()
+            container = containers.pop()
+            if self.stats is not None:
+                start = perf_counter()
+            if node is not None:
+                self.__record(node, container)
+            placed = len(self.__packing_index)
+            phase = self.__choose_phase(*container)
+            sub_containers = [] if phase is None \
+                else phase[0](*phase[1])
+            if self.stats is not None:
+                self.stats.add_container(
+                    None if phase is None else phase[0].__name__.strip('_'),
+                    depth, perf_counter() - start)
+            containers.extend(reversed(sub_containers))
+            depths.extend([depth + 1] * len(sub_containers))
+            if node is None:
+                nodes.extend([None] * len(sub_containers))
+                continue
+            node.own = self.__packing_index[placed:]
+            for i in node.own:
+                self.__node_of[i] = node
+            node.children = [_Container(*sub_container[:3], node)
+                             for sub_container in sub_containers]
+            nodes.extend(reversed(node.children))
+
+    def __record(self, node, container):
+        """
+        Record the elements to be packed into the container.
 
-        remained_elements.sort(key=lambda x: x[1], reverse=True)
-        if remained_elements[0][1] >= container_height / 2:
-            self.__pm1(container_origin, container_width,
-                       container_height, remained_elements)
+        Args:
+            node (_Container): The record of the container.
+            container (list):
+                The container, given as
+                [origin, width, height, by_width, by_height].
+
+        Modifies:
+            node (_Container):
+                Sets the total area and the largest sides of
+                the elements.
+
+        Returns:
+            None
+        """
+        by_width, by_height = container[3:]
+        node.own = []
+        node.children = []
+        if len(by_width) == 0:
+            node.area = node.max_width = node.max_height = 0
             return
+        node.area = self.__areas[by_width].sum().item()
+        node.max_width = self.__widths[by_width[0]].item()
+        node.max_height = self.__heights[by_height[0]].item()
+
+    def __choose_phase(self, container_origin, container_width,
+                       container_height, by_width, by_height):
+        """
+        Choose the phase of the Steinberg packing algorithm
+        for the container.
+
+        Args:
+            container_origin (list):
+                The [x, y] coordinates of the bottom-left corner
+                of the container where packing starts.
+            container_width (float):
+                Width of the container.
+            container_height (float):
+                Height of the container.
+            by_width (numpy.ndarray):
+                Indices of the elements remaining to be packed,
+                ordered by decreasing width.
+            by_height (numpy.ndarray):
+                Indices of the same elements,
+                ordered by decreasing height.
 
-        sum_area = sum(el[0]*el[1] for el in remained_elements)
-
-        if len(remained_elements) > 1:
-            remained_elements.sort(key=lambda x: x[0], reverse=True)
-            current_sum_area = 0
-            for i in range(len(remained_elements) - 1):
-                current_sum_area += remained_elements[i][0] \
-                                    * remained_elements[i][1]
-                if sum_area - container_width * container_height / 4 \
-                        <= current_sum_area \
-                        <= 3 * container_width * container_height / 8 and \
-                        remained_elements[i + 1][0] <= container_width / 4:
-                    self.__p3(i, current_sum_area, container_origin,
-                              container_width, container_height,
-                              remained_elements)
-                    return
-
-            remained_elements.sort(key=lambda x: x[1], reverse=True)
-            current_sum_area = 0
-            for i in range((len(remained_elements)) - 1):
-                current_sum_area += remained_elements[i][0] \
-                                    * remained_elements[i][1]
-                if sum_area - container_width * container_height / 4 \
-                        <= current_sum_area \
-                        <= 3 * container_width * container_height / 8 and \
-                        remained_elements[i + 1][1] <= container_height / 4:
-                    self.__pm3(i, current_sum_area, container_origin,
+        Returns:
+            tuple or None: The method performing the phase and its
+                arguments, or None if no phase can be applied.
+        """
+        if len(by_width) == 0:
+            return None
+
+        if self.__element_widths[by_width[0]] \
+                >= self.__at_least(container_width, 2):
+            return self.__p1, (container_origin, container_width,
+                               container_height, by_width, by_height)
+
+        if self.__element_heights[by_height[0]] \
+                >= self.__at_least(container_height, 2):
+            return self.__pm1, (container_origin, container_width,
+                                container_height, by_width, by_height)
+
+        height_prefix_areas = np.cumsum(self.__areas[by_height])
+        sum_area = height_prefix_areas[-1].item()
+        min_area, max_area = self.__area_bounds(
+            container_width, container_height, sum_area)
+
+        if len(by_height) > 1:
+            width_prefix_areas = np.cumsum(self.__areas[by_width])
+            index = self.__split_index(
+                width_prefix_areas, self.__widths[by_width],
+                container_width, min_area, max_area)
+            if index is not None:
+                return self.__p3, (
+                    index, width_prefix_areas[index].item(),
+                    container_origin, container_width, container_height,
+                    by_width, by_height)
+
+            index = self.__split_index(
+                height_prefix_areas, self.__heights[by_height],
+                container_height, min_area, max_area)
+            if index is not None:
+                return self.__pm3, (
+                    index, height_prefix_areas[index].item(),
+                    container_origin, container_width, container_height,
+                    by_width, by_height)
+
+            positions = ((self.__widths[by_height]
+                          >= self.__at_least(container_width, 4))
+                         & (self.__heights[by_height]
+                            >= self.__at_least(container_height, 4))
+                         ).nonzero()[0]
+            pair = self.__pair_indices(positions, by_height, 0,
+                                       container_width, container_height,
+                                       sum_area)
+            if pair is not None:
+                return self.__p2, (
+                    *pair, container_origin, container_width,
+                    container_height, by_width, by_height)
+
+            pair = self.__pair_indices(positions, by_height, 1,
+                                       container_width, container_height,
+                                       sum_area)
+            if pair is not None:
+                return self.__pm2, (
+                    *pair, container_origin, container_width,
+                    container_height, by_width, by_height)
+
+        positions = (self.__areas[by_height] >= min_area).nonzero()[0]
+        if len(positions) > 0:
+            return self.__p0, (positions[0].item(), container_origin,
                                container_width, container_height,
-                               remained_elements)
-                    return
-
-            for i in range(len(remained_elements)):
-                for k in range(i):
-                    if remained_elements[i][0] \
-                            >= container_width / 4 and \
-                            remained_elements[k][0] >=\
-                            container_width / 4 and \
-                            remained_elements[i][1] \
-                            >= container_height / 4 and \
-                            remained_elements[k][1] \
-                            >= container_height / 4 and \
-                            2 * (
-                            sum_area - remained_elements[i][0]
-                            * remained_elements[i][1]
-                            - remained_elements[k][0]
-                            * remained_elements[k][1]) \
-                            <= (container_width
-                                - max(remained_elements[i][0],
-                                      remained_elements[k][0])) \
-                            * container_height:
-                        self.__p2(i, k, container_origin, container_width,
-                                  container_height, remained_elements)
-                        return
-
-            for i in range(len(remained_elements)):
-                for k in range(i):
-                    if remained_elements[i][0] \
-                            >= container_width / 4 and \
-                            remained_elements[k][0] \
-                            >= container_width / 4 and \
-                            remained_elements[i][1] \
-                            >= container_height / 4 and \
-                            remained_elements[k][1] \
-                            >= container_height / 4 and \
-                            2 * (
-                            sum_area - remained_elements[i][0]
-                            * remained_elements[i][1]
-                            - remained_elements[k][0] *
-                            remained_elements[k][1]) \
-                            <= (container_height
-                                - max(remained_elements[i][1],
-                                      remained_elements[k][1])) \
-                            * container_width:
-                        self.__pm2(i, k, container_origin, container_width,
-                                   container_height, remained_elements)
-                        return
-
-        for i in range(len(remained_elements)):
-            if sum_area - container_width * container_height / 4 \
-                    <= remained_elements[i][0] * remained_elements[i][1]:
-                self.__p0(i, container_origin, container_width,
-                          container_height, remained_elements)
-                return
+                               by_width, by_height)
+        return None
+
+    def __pair_indices(self, positions, by_height, dimension,
+                       container_width, container_height, sum_area):
+        """
+        Find the pair of elements for the P2 or Pm2 phase.
+
+        Only elements with both sides at least a quarter of the
+        container can form the pair. When these phases are reached,
+        twice the remaining area does not exceed the container area,
+        so there are at most eight such elements and their pairs are
+        checked directly.
+
+        Args:
+            positions (numpy.ndarray):
+                Positions in `by_height` of the elements with both
+                sides at least a quarter of the container.
+            by_height (numpy.ndarray):
+                Indices of the elements remaining to be packed,
+                ordered by decreasing height.
+            dimension (int):
+                0 for the P2 phase, 1 for the Pm2 phase.
+            container_width (float):
+                Width of the container.
+            container_height (float):
+                Height of the container.
+            sum_area (float):
+                Total area of the remaining elements.
+
+        Returns:
+            tuple or None: Positions of the pair in `by_height`,
+                or None if the phase cannot be applied.
+        """
+        container_size = [container_width, container_height]
+        indices = by_height[positions]
+        sizes = (self.__element_widths, self.__element_heights)[dimension]
+        sizes = [sizes[i] for i in indices.tolist()]
+        areas = self.__areas[indices].tolist()
+        for i in range(len(sizes)):
+            for k in range(i):
+                if 2 * (sum_area - areas[i] - areas[k]) * self.__area_unit \
+                        <= (container_size[dimension]
+                            - max(sizes[i], sizes[k])) \
+                        * container_size[1 - dimension]:
+                    return positions[i].item(), positions[k].item()
+        return None
+
+    def __split_index(self, prefix_areas, sizes, container_size,
+                      min_area, max_area):
+        """
+        Find the split position of the P3 or Pm3 phase.
+
+        The prefix areas never decrease, so the positions whose prefix
+        area lies between `min_area` and `max_area` form a window
+        found by binary search. Within that window the first position
+        followed by an element not larger than a quarter of the
+        container is taken.
+
+        Args:
+            prefix_areas (numpy.ndarray):
+                Cumulative areas of the ordered elements.
+            sizes (numpy.ndarray):
+                Widths (for P3) or heights (for Pm3) of the ordered
+                elements, in decreasing order.
+            container_size (float):
+                Width (for P3) or height (for Pm3) of the container.
+            min_area (float), max_area (float):
+                Bounds of the area of the first part,
+                as given by `__area_bounds`.
+
+        Returns:
+            int or None: The last position of the first part,
+                or None if the phase cannot be applied.
+        """
+        prefix_areas = prefix_areas[:-1]
+        first = prefix_areas.searchsorted(min_area, 'left')
+        last = prefix_areas.searchsorted(max_area, 'right')
+        if first >= last:
+            return None
+        fits = (sizes[first + 1:last + 1]
+                <= self.__at_most(container_size, 4)).nonzero()[0]
+        if len(fits) == 0:
+            return None
+        return int(first) + fits[0].item()
+
+    def __at_least(self, size, divisor):
+        """
+        Calculate the bound of `size / divisor` for the comparisons
+        `side >= bound` with the sides of the elements.
+
+        Args:
+            size (float): A size of the container.
+            divisor (int): The divisor of the size.
+
+        Returns:
+            float or int: The fraction, rounded up to a whole length
+                unit in the fixed-point mode.
+        """
+        if self.fixed_point:
+            return -(-size // divisor)
+        return size / divisor
+
+    def __at_most(self, size, divisor):
+        """
+        Calculate the bound of `size / divisor` for the comparisons
+        `side <= bound` with the sides of the elements.
+
+        Args:
+            size (float): A size of the container.
+            divisor (int): The divisor of the size.
+
+        Returns:
+            float or int: The fraction, rounded down to a whole length
+                unit in the fixed-point mode.
+        """
+        if self.fixed_point:
+            return size // divisor
+        return size / divisor
+
+    def __area_bounds(self, container_width, container_height, sum_area):
+        """
+        Calculate the bounds `sum_area - wh/4` and `3wh/8` on the areas
+        of the elements used by the P3, Pm3 and P0 phases.
+
+        In the fixed-point mode the bounds are converted exactly
+        to the integer areas of the elements.
+
+        Args:
+            container_width (float):
+                Width of the container.
+            container_height (float):
+                Height of the container.
+            sum_area (float):
+                Total area of the remaining elements.
+
+        Returns:
+            tuple: The lower and the upper bound.
+        """
+        if self.fixed_point:
+            container_area = container_width * container_height
+            return (-((container_area - 4 * sum_area * self.__area_unit)
+                      // (4 * self.__area_unit)),
+                    3 * container_area // (8 * self.__area_unit))
+        return (sum_area - container_width * container_height / 4,
+                3 * container_width * container_height / 8)
+
+    def __split_size(self, container_size, other_size, area):
+        """
+        Calculate the size of the first part of the P3 or Pm3 phase.
+
+        Args:
+            container_size (float):
+                Width (for P3) or height (for Pm3) of the container.
+            other_size (float):
+                The other size of the container.
+            area (float):
+                Total area of the elements of the first part.
+
+        Returns:
+            float or int: The size, rounded to `round_value` decimal
+                places, or rounded up to a whole length unit in the
+                fixed-point mode.
+        """
+        if self.fixed_point:
+            return max(-(-container_size // 2),
+                       -(-2 * area * self.__area_unit // other_size))
+        return round(max(container_size/2, 2*area/other_size),
+                     self.round_value)
+
+    def __split(self, order, part):
+        """
+        Split an order of elements into the elements of the part
+        and the remaining ones, keeping the relative order of both.
+
+        Args:
+            order (numpy.ndarray):
+                Indices of the elements in the required order.
+            part (numpy.ndarray):
+                Indices of the elements forming the part.
+
+        Returns:
+            tuple: Indices of the elements inside the part and
+                outside of it, each in the same order as in `order`.
+        """
+        self.__marked[part] = True
+        inside = self.__marked[order]
+        self.__marked[part] = False
+        return order[inside], order[~inside]
+
+    def __place(self, index, x, y):
+        """
+        Place the element at the given position.
+
+        Args:
+            index (int):
+                Index of the element in the input list.
+            x (float), y (float):
+                Coordinates of the bottom-left corner of the element.
+
+        Modifies:
+            self.__packing_index (list):
+                Appends the index of the element to this attribute
+                and its coordinates to `self.__x` and `self.__y`.
+
+        Returns:
+            None
+        """
+        self.__x.append(x)
+        self.__y.append(y)
+        self.__packing_index.append(index)
 
     def __p1(self, container_origin, container_width,
-             container_height, remained_elements):
+             container_height, by_width, by_height):
         """
         Perform the P1 phase of the Steinberg packing algorithm
         for the container.
@@ -338,77 +2026,72 @@ class SteinbergPacking(StripPacking):
                 The width of the container.
             container_height (int):
                 The height of the container.
-            remained_elements (list of lists):
-                A list of elements remaining to be packed,
-                where each element is [width, height].
+            by_width (numpy.ndarray):
+                Indices of the elements remaining to be packed,
+                ordered by decreasing width.
+            by_height (numpy.ndarray):
+                Indices of the same elements,
+                ordered by decreasing height.
 
         Modifies:
-            self.packing (list):
-                Appends the packed elements to this attribute.
+            self.__packing_index (list):
+                Appends the packed elements to this attribute and
+                their coordinates to `self.__x` and `self.__y`.
 
         Returns:
-            None.
+            list: Sub-containers left to pack, each given as
+                [origin, width, height, by_width, by_height].
         """
-        packing_last = len(self.packing) - 1
-        sum_height = remained_elements[0][1]
-        self.packing.append([container_origin, remained_elements[0]])
-        for i in range(1, len(remained_elements)):
-            if remained_elements[i][0] < container_width / 2:
-                del remained_elements[0:i]
-                break
-            self.packing.append(
-                [
-                    [container_origin[0],
-                     self.packing[packing_last + i][0][1]
-                     + self.packing[packing_last + i][1][1]],
-                    remained_elements[i]
-                ])
-            sum_height += remained_elements[i][1]
-        else:
-            del remained_elements[:]
-
-        if len(remained_elements) == 0:
-            return
-
-        remained_elements.sort(key=lambda x: x[1], reverse=True)
-        if remained_elements[0][1] <= container_height - sum_height:
-            self.__steinberg([container_origin[0],
-                              container_origin[1] + sum_height],
-                             container_width,
-                             container_height - sum_height,
-                             remained_elements)
-            return
-
-        packing_last = len(self.packing) - 1
-        sum_width = remained_elements[0][0]
-        self.packing.append([[container_origin[0]
-                              + container_width
-                              - remained_elements[0][0],
-                              container_origin[1]
-                              + container_height
-                              - remained_elements[0][1]],
-                             remained_elements[0]])
-        for i in range(1, len(remained_elements)):
-            if remained_elements[i][1] <= container_height - sum_height:
-                del remained_elements[0:i]
-                break
-            self.packing.append([[self.packing[packing_last + i][0][0]
-                                  - remained_elements[i][0],
-                                  container_origin[1] + container_height
-                                  - remained_elements[i][1]],
-                                 remained_elements[i]])
-            sum_width += remained_elements[i][0]
-        else:
-            del remained_elements[:]
-
-        self.__steinberg([container_origin[0],
-                          container_origin[1] + sum_height],
-                         container_width - sum_width,
-                         container_height - sum_height,
-                         remained_elements)
+        stacked = by_width[:np.count_nonzero(
+            self.__widths[by_width]
+            >= self.__at_least(container_width, 2))]
+        if (self.tie_break == 'size'
+                and len(by_width) == self.__count):
+            # Only the whole strip holds every element. There the
+            # elements come in the input order, which breaks ties
+            # between equally wide ones.
+            stacked = stacked[np.lexsort((stacked,
+                                          -self.__widths[stacked]))]
+        sum_height = 0
+        element_y = container_origin[1]
+        for i in stacked.tolist():
+            self.__place(i, container_origin[0], element_y)
+            element_y += self.__element_heights[i]
+            sum_height += self.__element_heights[i]
+
+        by_width = by_width[len(stacked):]
+        by_height = self.__split(by_height, stacked)[1]
+        if len(by_height) == 0:
+            return []
+
+        if self.__element_heights[by_height[0]] \
+                <= container_height - sum_height:
+            return [[[container_origin[0],
+                      container_origin[1] + sum_height],
+                     container_width,
+                     container_height - sum_height,
+                     by_width, by_height]]
+
+        hanging = by_height[:np.count_nonzero(
+            self.__heights[by_height] > container_height - sum_height)]
+        sum_width = 0
+        element_x = container_origin[0] + container_width
+        for i in hanging.tolist():
+            element_x -= self.__element_widths[i]
+            self.__place(i, element_x,
+                         container_origin[1] + container_height
+                         - self.__element_heights[i])
+            sum_width += self.__element_widths[i]
+
+        return [[[container_origin[0],
+                  container_origin[1] + sum_height],
+                 container_width - sum_width,
+                 container_height - sum_height,
+                 self.__split(by_width, hanging)[1],
+                 by_height[len(hanging):]]]
 
     def __pm1(self, container_origin, container_width,
-              container_height, remained_elements):
+              container_height, by_width, by_height):
         """
         Perform the Pm1 phase of the Steinberg packing algorithm
         for the container.
@@ -421,78 +2104,64 @@ class SteinbergPacking(StripPacking):
                 The width of the container.
             container_height (int):
                 The height of the container.
-            remained_elements (list of lists):
-                A list of elements remaining to be packed,
-                where each element is [width, height].
+            by_width (numpy.ndarray):
+                Indices of the elements remaining to be packed,
+                ordered by decreasing width.
+            by_height (numpy.ndarray):
+                Indices of the same elements,
+                ordered by decreasing height.
 
         Modifies:
-            self.packing (list):
-                Appends the packed elements to this attribute.
+            self.__packing_index (list):
+                Appends the packed elements to this attribute and
+                their coordinates to `self.__x` and `self.__y`.
 
         Returns:
-            None.
+            list: Sub-containers left to pack, each given as
+                [origin, width, height, by_width, by_height].
         """
-        packing_last = len(self.packing) - 1
-        sum_width = remained_elements[0][0]
-        self.packing.append([container_origin, remained_elements[0]])
-        for i in range(1, len(remained_elements)):
-            if remained_elements[i][1] < container_height / 2:
-                del remained_elements[0:i]
-                break
-            self.packing.append(
-                [
-                    [self.packing[packing_last + i][0][0]
-                     + self.packing[packing_last + i][1][0],
-                     container_origin[1]],
-                    remained_elements[i]
-                 ])
-            sum_width += remained_elements[i][0]
-        else:
-            del remained_elements[:]
-
-        if len(remained_elements) == 0:
-            return
-
-        remained_elements.sort(key=lambda x: x[0], reverse=True)
-        if remained_elements[0][0] <= container_width - sum_width:
-            self.__steinberg([container_origin[0] + sum_width,
-                              container_origin[1]],
-                             container_width - sum_width,
-                             container_height,
-                             remained_elements)
-            return
-
-        packing_last = len(self.packing) - 1
-        sum_height = remained_elements[0][1]
-        self.packing.append([[container_origin[0]
-                              + container_width
-                              - remained_elements[0][0],
-                              container_origin[1]
-                              + container_height
-                              - remained_elements[0][1]],
-                             remained_elements[0]])
-        for i in range(1, len(remained_elements)):
-            if remained_elements[i][0] <= container_width - sum_width:
-                del remained_elements[0:i]
-                break
-            self.packing.append([[container_origin[0]
-                                  + container_width
-                                  - remained_elements[i][0],
-                                  self.packing[packing_last + i][0][1]
-                                  - remained_elements[i][1]],
-                                 remained_elements[i]])
-            sum_height += remained_elements[i][1]
-        else:
-            del remained_elements[:]
-
-        self.__steinberg([sum_width + container_origin[0],
-                          container_origin[1]],
-                         container_width - sum_width,
-                         container_height - sum_height,
-                         remained_elements)
+        stacked = by_height[:np.count_nonzero(
+            self.__heights[by_height]
+            >= self.__at_least(container_height, 2))]
+        sum_width = 0
+        element_x = container_origin[0]
+        for i in stacked.tolist():
+            self.__place(i, element_x, container_origin[1])
+            element_x += self.__element_widths[i]
+            sum_width += self.__element_widths[i]
+
+        by_height = by_height[len(stacked):]
+        by_width = self.__split(by_width, stacked)[1]
+        if len(by_width) == 0:
+            return []
+
+        if self.__element_widths[by_width[0]] \
+                <= container_width - sum_width:
+            return [[[container_origin[0] + sum_width,
+                      container_origin[1]],
+                     container_width - sum_width,
+                     container_height,
+                     by_width, by_height]]
+
+        hanging = by_width[:np.count_nonzero(
+            self.__widths[by_width] > container_width - sum_width)]
+        sum_height = 0
+        element_y = container_origin[1] + container_height
+        for i in hanging.tolist():
+            element_y -= self.__element_heights[i]
+            self.__place(i, container_origin[0] + container_width
+                         - self.__element_widths[i], element_y)
+            sum_height += self.__element_heights[i]
+
+        return [[[sum_width + container_origin[0],
+                  container_origin[1]],
+                 container_width - sum_width,
+                 container_height - sum_height,
+                 by_width[len(hanging):],
+                 self.__split(by_height, hanging)[1]]]
 
     def __p3(self, current_index, current_sum_area, container_origin,
-             container_width, container_height, remained_elements):
+             container_width, container_height, by_width, by_height):
         """
         Perform the P3 phase of the Steinberg packing algorithm
         for the container.
@@ -505,35 +2174,36 @@ class SteinbergPacking(StripPacking):
                 The width of the container.
             container_height (int):
                 The height of the container.
-            remained_elements (list of lists):
-                A list of elements remaining to be packed,
-                where each element is [width, height].
+            by_width (numpy.ndarray):
+                Indices of the elements remaining to be packed,
+                ordered by decreasing width.
+            by_height (numpy.ndarray):
+                Indices of the same elements,
+                ordered by decreasing height.
 
         Modifies:
-            self.packing (list):
-                Appends the packed elements to this attribute.
+            self.__packing_index (list):
+                Appends the packed elements to this attribute and
+                their coordinates to `self.__x` and `self.__y`.
 
         Returns:
-            None.
+            list: Sub-containers left to pack, each given as
+                [origin, width, height, by_width, by_height].
         """
-        width1 = round(max(container_width/2,
-                           2*current_sum_area/container_height),
-                       self.round_value)
+        width1 = self.__split_size(container_width, container_height,
+                                   current_sum_area)
         width2 = container_width - width1
-        remained_elements1, remained_elements2 = [], []
-        for i in range(len(remained_elements)):
-            if i <= current_index:
-                remained_elements1.append(remained_elements[i])
-            else:
-                remained_elements2.append(remained_elements[i])
-        self.__steinberg(container_origin, width1,
-                         container_height, remained_elements1)
-        self.__steinberg([container_origin[0] + width1, container_origin[1]],
-                         width2, container_height, remained_elements2)
+        by_width1 = by_width[:current_index + 1]
+        by_height1, by_height2 = self.__split(by_height, by_width1)
+        return [[container_origin, width1,
+                 container_height, by_width1, by_height1],
+                [[container_origin[0] + width1, container_origin[1]],
+                 width2, container_height,
+                 by_width[current_index + 1:], by_height2]]
 
     def __pm3(self, current_index, current_sum_area,
               container_origin, container_width,
-              container_height, remained_elements):
+              container_height, by_width, by_height):
         """
         Perform the Pm3 phase of the Steinberg packing algorithm
         for the container.
@@ -546,39 +2216,42 @@ class SteinbergPacking(StripPacking):
                 The width of the container.
             container_height (int):
                 The height of the container.
-            remained_elements (list of lists):
-                A list of elements remaining to be packed,
-                where each element is [width, height].
+            by_width (numpy.ndarray):
+                Indices of the elements remaining to be packed,
+                ordered by decreasing width.
+            by_height (numpy.ndarray):
+                Indices of the same elements,
+                ordered by decreasing height.
 
         Modifies:
-            self.packing (list):
-                Appends the packed elements to this attribute.
+            self.__packing_index (list):
+                Appends the packed elements to this attribute and
+                their coordinates to `self.__x` and `self.__y`.
 
         Returns:
-            None.
+            list: Sub-containers left to pack, each given as
+                [origin, width, height, by_width, by_height].
         """
-        height1 = round(max(container_height/2,
-                            2*current_sum_area/container_width),
-                        self.round_value)
+        height1 = self.__split_size(container_height, container_width,
+                                    current_sum_area)
         height2 = container_height - height1
-        remained_elements1, remained_elements2 = [], []
-        for i in range(len(remained_elements)):
-            if i <= current_index:
-                remained_elements1.append(remained_elements[i])
-            else:
-                remained_elements2.append(remained_elements[i])
-        self.__steinberg(container_origin, container_width,
-                         height1, remained_elements1)
-        self.__steinberg([container_origin[0], container_origin[1] + height1],
-                         container_width, height2, remained_elements2)
+        by_height1 = by_height[:current_index + 1]
+        by_width1, by_width2 = self.__split(by_width, by_height1)
+        return [[container_origin, container_width,
+                 height1, by_width1, by_height1],
+                [[container_origin[0], container_origin[1] + height1],
+                 container_width, height2,
+                 by_width2, by_height[current_index + 1:]]]
 
     def __p2(self, index1, index2, container_origin,
-             container_width, container_height, remained_elements):
+             container_width, container_height, by_width, by_height):
         """
         Perform the P2 phase of the Steinberg packing algorithm
         for the container.
 
         Args:
+            index1 (int), index2 (int):
+                Positions of the pair of elements in `by_height`.
             container_origin (list of int):
                 The [x, y] coordinates of the bottom-left corner
                 of the container where packing starts.
@@ -586,42 +2259,46 @@ class SteinbergPacking(StripPacking):
                 The width of the container.
             container_height (int):
                 The height of the container.
-            remained_elements (list of lists):
-                A list of elements remaining to be packed,
-                where each element is [width, height].
+            by_width (numpy.ndarray):
+                Indices of the elements remaining to be packed,
+                ordered by decreasing width.
+            by_height (numpy.ndarray):
+                Indices of the same elements,
+                ordered by decreasing height.
 
         Modifies:
-            self.packing (list):
-                Appends the packed elements to this attribute.
-
-        Returns:
-            None.
-        """
-        if remained_elements[index2][0] > remained_elements[index1][0]:
-            index = index1
-            index1 = index2
-            index2 = index
-        self.packing.append([container_origin, remained_elements[index1]])
-        self.packing.append(
-            [[container_origin[0], container_origin[1]
-              + remained_elements[index1][1]], remained_elements[index2]])
-        element_width = remained_elements[index1][0]
-        if index1 < index2:
-            del remained_elements[index2], remained_elements[index1]
-        else:
-            del remained_elements[index1], remained_elements[index2]
-        self.__steinberg([container_origin[0] + element_width,
-                          container_origin[1]],
-                         container_width - element_width,
-                         container_height, remained_elements)
+            self.__packing_index (list):
+                Appends the packed elements to this attribute and
+                their coordinates to `self.__x` and `self.__y`.
+
+        Returns:
+            list: Sub-containers left to pack, each given as
+                [origin, width, height, by_width, by_height].
+        """
+        placed = by_height[[index1, index2]]
+        index1, index2 = placed.tolist()
+        if self.__element_widths[index2] > self.__element_widths[index1]:
+            index1, index2 = index2, index1
+        width1 = self.__element_widths[index1]
+        self.__place(index1, *container_origin)
+        self.__place(index2, container_origin[0],
+                     container_origin[1] + self.__element_heights[index1])
+        return [[[container_origin[0] + width1,
+                  container_origin[1]],
+                 container_width - width1,
+                 container_height,
+                 self.__split(by_width, placed)[1],
+                 self.__split(by_height, placed)[1]]]
 
     def __pm2(self, index1, index2, container_origin,
-              container_width, container_height, remained_elements):
+              container_width, container_height, by_width, by_height):
         """
         Perform the Pm2 phase of the Steinberg packing algorithm
         for the container.
 
         Args:
+            index1 (int), index2 (int):
+                Positions of the pair of elements in `by_height`.
             container_origin (list of int):
                 The [x, y] coordinates of the bottom-left corner
                 of the container where packing starts.
@@ -629,43 +2306,46 @@ class SteinbergPacking(StripPacking):
                 The width of the container.
             container_height (int):
                 The height of the container.
-            remained_elements (list of lists):
-                A list of elements remaining to be packed,
-                where each element is [width, height].
+            by_width (numpy.ndarray):
+                Indices of the elements remaining to be packed,
+                ordered by decreasing width.
+            by_height (numpy.ndarray):
+                Indices of the same elements,
+                ordered by decreasing height.
 
         Modifies:
-            self.packing (list):
-                Appends the packed elements to this attribute.
-
-        Returns:
-            None.
-        """
-        if remained_elements[index2][1] > remained_elements[index1][1]:
-            index = index1
-            index1 = index2
-            index2 = index
-        self.packing.append([container_origin, remained_elements[index1]])
-        self.packing.append(
-            [[container_origin[0] + remained_elements[index1][0],
-              container_origin[1]], remained_elements[index2]])
-        element_height = remained_elements[index1][1]
-        if index1 < index2:
-            del remained_elements[index2], remained_elements[index1]
-        else:
-            del remained_elements[index1], remained_elements[index2]
-        self.__steinberg([container_origin[0],
-                          container_origin[1] + element_height],
-                         container_width,
-                         container_height - element_height,
-                         remained_elements)
+            self.__packing_index (list):
+                Appends the packed elements to this attribute and
+                their coordinates to `self.__x` and `self.__y`.
+
+        Returns:
+            list: Sub-containers left to pack, each given as
+                [origin, width, height, by_width, by_height].
+        """
+        placed = by_height[[index1, index2]]
+        index1, index2 = placed.tolist()
+        if self.__element_heights[index2] > self.__element_heights[index1]:
+            index1, index2 = index2, index1
+        height1 = self.__element_heights[index1]
+        self.__place(index1, *container_origin)
+        self.__place(index2, container_origin[0]
+                     + self.__element_widths[index1], container_origin[1])
+        return [[[container_origin[0],
+                  container_origin[1] + height1],
+                 container_width,
+                 container_height - height1,
+                 self.__split(by_width, placed)[1],
+                 self.__split(by_height, placed)[1]]]
 
     def __p0(self, index, container_origin, container_width,
-             container_height, remained_elements):
+             container_height, by_width, by_height):
         """
         Perform the P0 phase of the Steinberg packing algorithm
         for the container.
 
         Args:
+            index (int):
+                Position of the element in `by_height`.
             container_origin (list of int):
                 The [x, y] coordinates of the bottom-left corner
                 of the container where packing starts.
@@ -673,21 +2353,90 @@ class SteinbergPacking(StripPacking):
                 The width of the container.
             container_height (int):
                 The height of the container.
-            remained_elements (list of lists):
-                A list of elements remaining to be packed,
-                where each element is [width, height].
+            by_width (numpy.ndarray):
+                Indices of the elements remaining to be packed,
+                ordered by decreasing width.
+            by_height (numpy.ndarray):
+                Indices of the same elements,
+                ordered by decreasing height.
 
         Modifies:
-            self.packing (list):
-                Appends the packed elements to this attribute.
+            self.__packing_index (list):
+                Appends the packed elements to this attribute and
+                their coordinates to `self.__x` and `self.__y`.
 
         Returns:
-            None.
+            list: Sub-containers left to pack, each given as
+                [origin, width, height, by_width, by_height].
         """
-        self.packing.append([container_origin, remained_elements[index]])
-        element_width = remained_elements[index][0]
-        del remained_elements[index]
-        self.__steinberg([container_origin[0] + element_width,
-                          container_origin[1]],
-                         container_width - element_width,
-                         container_height, remained_elements)
+        element_width = self.__element_widths[by_height[index]]
+        self.__place(by_height[index].item(), *container_origin)
+        placed = by_height[index:index + 1]
+        return [[[container_origin[0] + element_width,
+                  container_origin[1]],
+                 container_width - element_width,
+                 container_height,
+                 self.__split(by_width, placed)[1],
+                 np.delete(by_height, index)]]
+
+
+def pack(strip_width, elements, deadline=None, cancel=None, **options):
+    """
+    Pack the elements without any state shared between calls.
+
+    Every call packs with its own SteinbergPacking, which costs
+    a few microseconds, and returns a frozen result, so calls can run
+    concurrently in threads. Only a cache given in the options is
+    shared, and it is locked.
+
+    Args:
+        strip_width (int): The width of the strip for packing.
+        elements (list of lists or numpy.ndarray):
+            Elements to be packed, each given as [width, height],
+            or an (n, 2) array of them.
+        deadline (float, optional):
+            The `time.monotonic()` time to stop packing at, as in
+            `get_packing`. Defaults to None.
+        cancel (threading.Event, optional):
+            An object whose `is_set()` method tells to stop packing,
+            as in `get_packing`. Defaults to None.
+        **options:
+            Keyword arguments of SteinbergPacking.
+
+    Returns:
+        PackingResult or None: The frozen packing in the column form,
+            or None if the packing is not feasible.
+    """
+    result = SteinbergPacking(strip_width, **options).get_packing(
+        elements, deadline, cancel)
+    if result is None:
+        return None
+    return result.freeze()
+
+
+def _init_worker(packing):
+    """
+    Store the prepared packing in a worker process.
+
+    Args:
+        packing (SteinbergPacking): The packing made by
+            `__worker_packing`.
+    """
+    global _worker_packing
+    _worker_packing = packing
+
+
+def _pack_part(container):
+    """
+    Pack a part in a worker process.
+
+    Args:
+        container (list):
+            The part, given as [origin, width, height, by_width,
+            by_height].
+
+    Returns:
+        tuple: The coordinates of the placed elements, their indices
+            and whether the part was stopped.
+    """
+    return _worker_packing._pack_part(container)
@@ -0,0 +1,106 @@
+from src.packing_result import PackingResult
+from src.steinberg_packing import SteinbergPacking
+
+
+class StreamingPacking:
+    """
+    A class for packing a stream of elements band by band.
+
+    Elements are buffered until a band is full, then the band is packed
+    with the Steinberg algorithm on top of the previous bands and its
+    placements are final. Only one band is kept in memory at a time.
+
+    Attributes:
+        width (int):
+            The width of the strip for packing.
+        band_size (int):
+            The number of elements packed together in a band.
+        height (float):
+            The height of the bands closed so far.
+    """
+
+    def __init__(self, strip_width: int, band_size=10000,
+                 without_gaps=False, drop_hanging_element=False,
+                 round_value=6):
+        """
+        Initialize StreamingPacking class with a given strip width.
+
+        Args:
+            strip_width (int): The width of the strip for packing.
+            band_size (int, optional):
+                The number of elements packed together in a band.
+                Defaults to 10000.
+            without_gaps (bool, optional):
+                Whether to remove gaps in every band.
+                Defaults to False.
+            drop_hanging_element (bool, optional):
+                Whether to drop hanging elements in every band.
+                Defaults to False.
+            round_value (int, optional):
+                Number of decimal places to round heights.
+                Defaults to 6.
+        """
+        self.width = strip_width
+        self.band_size = band_size
+        self.without_gaps = without_gaps
+        self.drop_hanging_element = drop_hanging_element
+        self.round_value = round_value
+        self.height = 0
+
+    def pack(self, elements):
+        """
+        Pack the elements as they arrive.
+
+        Args:
+            elements (iterable of lists):
+                Elements to be packed, each given as [width, height].
+                It may be a generator producing them one by one.
+
+        Yields:
+            PackingResult or None: The placements of every closed band.
+                The `index` column holds positions in the stream, so
+                `in_input_order()` puts the rows in the stream order
+                within the band. None is yielded for a band which
+                cannot be packed.
+        """
+        self.height = 0
+        band = []
+        first_index = 0
+        for element in elements:
+            band.append(element)
+            if len(band) == self.band_size:
+                yield self.__close_band(band, first_index)
+                first_index += len(band)
+                band = []
+        if len(band) > 0:
+            yield self.__close_band(band, first_index)
+
+    def __close_band(self, band, first_index):
+        """
+        Pack the band on top of the previous bands.
+
+        Args:
+            band (list of lists):
+                Elements of the band, each given as [width, height].
+            first_index (int):
+                Position of the first element of the band in the stream.
+
+        Modifies:
+            self.height (float):
+                Adds the height of the band to this attribute.
+
+        Returns:
+            PackingResult or None: The placements of the band, or None
+                if the band cannot be packed.
+        """
+        result = SteinbergPacking(
+            self.width, self.without_gaps, self.drop_hanging_element,
+            self.round_value).get_packing(band)
+        if result is None:
+            return None
+        band_result = PackingResult(
+            self.width, self.height + result.height,
+            result.x, result.y + self.height, result.w, result.h,
+            result.index + first_index)
+        self.height += result.max_height()
+        return band_result
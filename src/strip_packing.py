@@ -1,6 +1,31 @@
 from abc import ABC, abstractmethod
-from copy import deepcopy
-from matplotlib import patches, pyplot as plt
+
+import numpy as np
+
+from src.packing_validation import find_column_problems, find_problems
+
+
+def element_sizes(elements):
+    """
+    Get the widths and the heights of the elements as arrays.
+
+    Args:
+        elements (list of lists or numpy.ndarray):
+            Elements, each given as [width, height], or an (n, 2)
+            array of them, or any object supporting the buffer protocol
+            with this layout.
+
+    Returns:
+        tuple: The widths and the heights (numpy.ndarray), as int64
+            for integer sizes and as float64 otherwise, so areas and
+            scaled sizes of narrow types do not overflow. For an array
+            of these types they are views of its columns, so nothing
+            is copied.
+    """
+    sizes = np.asarray(elements)
+    dtype = np.int64 if sizes.dtype.kind in 'iu' else np.float64
+    sizes = sizes.astype(dtype, copy=False).reshape(-1, 2)
+    return sizes[:, 0], sizes[:, 1]
 
 
 class StripPacking(ABC):
@@ -16,10 +41,13 @@ class StripPacking(ABC):
     Attributes:
         width (int):
             The width of the strip for packing.
+        result (PackingResult or None):
+            The packing in the column form, which the algorithms keep
+            as their main storage.
         packing (list):
-            A list to store the packed elements.
-            Each element is represented as a list of two lists:
-            the first list contains the [x, y] coordinates
+            The packed elements in the list form, built from `result`
+            when first used. Each element is represented as a list of
+            two lists: the first list contains the [x, y] coordinates
             of the bottom-left corner of the element,
             and the second list contains its [width, height].
         height (float): The estimated height of the packing.
@@ -38,17 +66,58 @@ class StripPacking(ABC):
         Initializes:
             self.width (int):
                 Sets the strip width.
-            self.packing (list):
-                Initializes as an empty list to hold the packing
-                result. Expected to be set by the packing algorithm.
+            self.result (PackingResult or None):
+                Initializes as None. Expected to be set by
+                the packing algorithm.
             self.height (int or None):
                 Initializes as None. Expected to be set by
                 the packing algorithm.
         """
         self.width = strip_width
-        self.packing = []
+        self.result = None
         self.height = None
 
+    @property
+    def result(self):
+        """
+        PackingResult or None: The packing in the column form.
+        Setting it discards the list form built from the previous one.
+        """
+        return self.__result
+
+    @result.setter
+    def result(self, result):
+        self.__result = result
+        self.__packing = None
+
+    @property
+    def packing(self):
+        """
+        list: The packing in the list form. It is built from `result`
+        on first access only, so algorithms producing millions of
+        elements do not keep millions of small lists unless they are
+        asked for. Later changes of the list are kept until `result`
+        is set again.
+        """
+        if self.__packing is None:
+            self.__packing = [] if self.__result is None \
+                else self.__result.to_packing()
+        return self.__packing
+
+    @packing.setter
+    def packing(self, packing):
+        self.__packing = packing
+
+    def __columns_in_use(self):
+        """
+        Check whether the column form describes the packing, that is,
+        whether the list form has not been built and changed.
+
+        Returns:
+            bool: Whether `result` can be used instead of `packing`.
+        """
+        return self.__packing is None and self.__result is not None
+
     def print_info(self):
         """
         Print the packing information to the console.
@@ -71,13 +140,52 @@ class StripPacking(ABC):
         Returns:
             float: The maximum height of the packing.
         """
+        if self.__columns_in_use():
+            return self.__result.max_height()
         return max(packing_el[0][1] + packing_el[1][1]
                    for packing_el in self.packing)
 
-    def plot_packing(self, colors, file_name):
+    def validate(self, elements=None, tolerance=0):
+        """
+        Check the packing for overlapping elements, elements outside
+        the strip and elements packed a wrong number of times.
+
+        The check takes O(n log n) time for a valid packing
+        of n elements.
+
+        Args:
+            elements (list of lists, optional):
+                Elements which must be packed, each given as
+                [width, height]. Defaults to None, skipping the check.
+            tolerance (float, optional):
+                Overlaps and protrusions not longer than the tolerance
+                are ignored. Defaults to 0.
+
+        Returns:
+            list of tuple: The problems, empty for a valid packing:
+                ('count', size, expected, packed) for a size of
+                elements packed a wrong number of times, ('outside', i)
+                for the element `i` of `self.packing` crossing the
+                border of the strip, and ('overlap', i, k) for
+                the overlapping elements `i` and `k`.
+        """
+        if self.__columns_in_use():
+            result = self.__result
+            return find_column_problems(
+                result.x, result.y, result.w, result.h, self.width,
+                self.height, elements, tolerance)
+        return find_problems(self.packing, self.width, self.height,
+                             elements, tolerance)
+
+    def plot_packing(self, colors, file_name, in_place=True):
         """
         Plot and save the visual representation of the packing.
 
+        The elements are sorted by their sizes before plotting, so the
+        same colors describe the same elements for different packings.
+        All elements are drawn as one collection of polygons, and
+        matplotlib is imported only on the first call.
+
         Args:
             colors (list of str):
                 A list of colors for the packed elements.
@@ -85,23 +193,38 @@ class StripPacking(ABC):
                 an element in the `packing`.
             file_name (str): The name of the file
             where the plot will be saved.
+            in_place (bool, optional):
+                Whether to sort `self.packing` itself. If False,
+                a sorted copy is plotted and `self.packing` keeps
+                its order. Defaults to True.
 
         Example:
             colors = ['red', 'blue', 'green', ...]
             file_name = 'packing_result.png'
         """
+        from matplotlib import pyplot as plt
+        from matplotlib.collections import PolyCollection
+
+        packing = self.packing if in_place else list(self.packing)
+        packing.sort(key=lambda x: x[1][0])
+        packing.sort(key=lambda x: x[1][1])
+        rectangles = np.array([packing_el[0] + packing_el[1]
+                               for packing_el in packing],
+                              dtype=float).reshape(-1, 4)
+        corners = np.empty((len(rectangles), 4, 2))
+        corners[:, :, 0] = rectangles[:, [0]]
+        corners[:, :, 1] = rectangles[:, [1]]
+        corners[:, 1:3, 0] += rectangles[:, [2]]
+        corners[:, 2:, 1] += rectangles[:, [3]]
 
-        self.packing.sort(key=lambda x: x[1][0])
-        self.packing.sort(key=lambda x: x[1][1])
         figure, axis = plt.subplots(1)
         axis.set_xlim(0, self.width)
         axis.set_ylim(0, max(self.height, self.max_height()))
-        for i in range(len(self.packing)):
-            axis.add_patch(patches.Rectangle(
-                tuple(self.packing[i][0]),
-                self.packing[i][1][0], self.packing[i][1][1],
-                linewidth=0.5, edgecolor='black', facecolor=colors[i]))
+        axis.add_collection(PolyCollection(
+            corners, linewidth=0.5, edgecolor='black',
+            facecolor=colors[:len(packing)]))
         plt.savefig(file_name)
+        plt.close(figure)
 
     @abstractmethod
     def get_packing(self, elements):
@@ -120,7 +243,11 @@ class StripPacking(ABC):
                 Example:
                     [[width1, height1], [width2, height2], ...]
 
-        This method should set the `self.packing` and `self.height`
+        This method should set the `self.result` and `self.height`
         attributes to reflect the calculated packing.
+
+        Returns:
+            PackingResult or None: The calculated packing in the column
+                form, or None if the packing is not feasible.
         """
         pass